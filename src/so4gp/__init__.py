@@ -4,6 +4,10 @@ from .gradual_patterns import GP
 from .gradual_patterns import TGP
 from .gradual_patterns import TimeDelay
 from .gradual_patterns import PairwiseMatrix
+from .gradual_patterns import ValidBins
+from .support_engine import SupportEngine
+from .bitmap_store import BitmapStore
+from .fit_cache import FitCache
 
 from .utils import get_num_cores
 from .utils import get_slurm_cores
@@ -28,6 +32,10 @@ __all__ = [
     "TGP",
     "TimeDelay",
     "PairwiseMatrix",
+    "ValidBins",
+    "SupportEngine",
+    "BitmapStore",
+    "FitCache",
     "get_num_cores",
     "get_slurm_cores",
     "analyze_gps"
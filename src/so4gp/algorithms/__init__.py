@@ -7,6 +7,7 @@ from .graank_hc import HillClimbingGRAANK
 from .numeric_ss import NumericSS
 from .graank_pso import ParticleGRAANK
 from .graank_rand import RandomGRAANK
+from .graank_sliding import SlidingGRAANK
 from .tgrad import TGrad
 from .tgrad_ami import TGradAMI
 
@@ -20,6 +21,7 @@ __all__ = [
     "NumericSS",
     "ParticleGRAANK",
     "RandomGRAANK",
+    "SlidingGRAANK",
     "TGrad",
     "TGradAMI",
 ]
\ No newline at end of file
@@ -61,6 +61,18 @@ class ClusterGP(DataGP):
         n = self.row_count
         prob = 1 - e  # Sample probability
 
+        # 0. Reuse cached matrices (only if all the pairs are used, since sampled pairs are random)
+        cache_name = "cluster_matrices"
+        if prob == 1 and self.fit_cache is not None:
+            cached = self.fit_cache.load_arrays(self.fingerprint, cache_name)
+            if cached is not None:
+                self._gradual_items = np.array([GI.from_string(gi_str) for gi_str in cached['gradual_items']])
+                self._win_mat = cached['win_mat']
+                self._cum_wins = cached['cum_wins']
+                self._net_win_mat = cached['net_win_mat']
+                self._ij = cached['ij']
+                return
+
         if prob == 1:
             # 1a. Generate all possible pairs
             pair_ij = np.array(np.meshgrid(np.arange(n), np.arange(n))).T.reshape(-1, 2)
@@ -77,7 +89,7 @@ class ClusterGP(DataGP):
             pair_ij = pair_ij[np.argwhere(pair_ij[:, 0] != pair_ij[:, 1])[:, 0]]
 
         # 2. Variable declarations
-        attr_data = self.data.T  # Feature data objects
+        attr_data = self.attr_data  # Feature data objects (one row per column)
         lst_gis = []  # List of GIs
         s_mat = []  # S-Matrix (made up of S-Vectors)
         w_mat = []  # win matrix
@@ -86,7 +98,7 @@ class ClusterGP(DataGP):
         # 3. Construct S matrix from the data set
         for col in self.attr_cols:
             # Feature data objects
-            col_data = np.array(attr_data[col], dtype=float)  # Feature data objects
+            col_data = attr_data[col]  # Feature data objects
 
             # Cumulative Wins: for estimation of score-vector
             temp_cum_wins = np.where(col_data[pair_ij[:, 0]] < col_data[pair_ij[:, 1]], 1,
@@ -122,6 +134,12 @@ class ClusterGP(DataGP):
         self._cum_wins = np.array(cum_wins)
         self._net_win_mat = np.array(s_mat)
         self._ij = pair_ij
+        if prob == 1 and self.fit_cache is not None:
+            self.fit_cache.save_arrays(self.fingerprint, cache_name,
+                                       gradual_items=np.array([gi.to_string() for gi in lst_gis], dtype=str),
+                                       win_mat=self._win_mat, cum_wins=self._cum_wins,
+                                       net_win_mat=self._net_win_mat, ij=self._ij)
+            self.fit_cache.evict(keep=self.fingerprint)
 
     def _infer_gps(self, clusters: np.ndarray) -> list[GP]:
         """
@@ -4,13 +4,12 @@
 # See the LICENSE file at the root of this
 # repository for complete details.
 
-import gc
+import heapq
 import json
-import copy
 import time
 import numpy as np
 from ..data_gp import DataGP
-from ..gradual_patterns import GI, GP, PairwiseMatrix
+from ..gradual_patterns import GI, GP, PairwiseMatrix, ValidBins
 
 
 class GRAANK(DataGP):
@@ -26,7 +25,9 @@ class GRAANK(DataGP):
              with a support of 0.8. This implies that 8 out of 10 objects have the values of column age 'increasing' and
              column 'salary' decreasing.
 
-        This class extends class DataGP which is responsible for generating the GP bitmaps.
+        This class extends class DataGP which is responsible for generating the GP bitmaps. The supports of the
+        evaluated candidates are tracked, so that new rows can be appended (see DataGP.append_rows) without mining the
+        whole dataset again.
 
         :param args: [required] data source path of Pandas DataFrame, [optional] minimum-support, [optional] eq
 
@@ -45,32 +46,40 @@ class GRAANK(DataGP):
         super(GRAANK, self).__init__(*args, **kwargs)
 
     def _gen_apriori_candidates(self, gi_dict: dict|None, ignore_sup: bool = False,
-                                target_col: int | None = None, exclude_target: bool = False):
+                                target_col: int | None = None, exclude_target: bool = False,
+                                max_supports: dict | None = None, supports: dict | None = None,
+                                track: bool = False, top_k: int | None = None, top_supports: list[float] | None = None):
         """
         Generates Apriori GP candidates (w.r.t target-feature/reference-column if provided). If a user wishes to generate
         candidates that do not contain the target-feature, then they do so by specifying the exclude_target parameter.
 
+        The itemsets are canonical tuples: gradual items sorted by column, the first one increasing (a GP and its
+        inverse share the tuple, so a candidate is never generated twice). Candidates are built through a prefix join:
+        two k-itemsets that share their first k-1 items yield a (k+1)-candidate, which is pruned (before any AND) unless
+        all its k-subsets are valid. If a target feature must be part of the candidates, the itemsets are joined with
+        the target item first, and only the subsets that contain it are checked.
+
         :param gi_dict: List of GIs together with bitmap arrays.
         :param ignore_sup: Do not filter GPs based on the minimum support threshold.
         :param target_col: Target feature's column index.
         :param exclude_target: Only accepts GP candidates that do not contain the target feature.
+        :param max_supports: [optional] upper bounds of the supports of some candidates (e.g., carried from another
+        transformation of the data); a candidate whose bound does not exceed the minimum support is rejected before its
+        support is computed.
+        :param supports: [optional] a dict that receives the support of every evaluated candidate.
+        :param track: Record the support of every evaluated candidate, so that append_rows keeps it up to date.
+        :param top_k: [optional] only accept the candidates whose support is among the K best supports found so far.
+        :param top_supports: Min-heap of the K best supports (see GRAANK.push_top_support), required with top_k.
         :return: List of extracted GPs and the invalid count.
         """
 
-        def invert_symbol(gi_item: str) -> str:
-            """Description
-
-            Computes the inverse of a GI formatted as an array or tuple
+        def get_col(gi_str: str) -> int:
+            return int(gi_str[:-1])
 
-            :param gi_item: gradual item as a string (e.g., '1+' or '1-')
-            :return: inverted gradual item
-            """
-            if gi_item.endswith("+"):
-                return gi_item.replace("+", "-")
-            elif gi_item.endswith("-"):
-                return gi_item.replace("-", "+")
-            else:
-                return gi_item
+        def get_join_form(items) -> tuple[str, ...]:
+            """Orders the items for the prefix join (the target item first, if required) with the first one increasing"""
+            items = sorted(items, key=lambda gi_str: (get_col(gi_str) != join_col, get_col(gi_str)))
+            return tuple(items) if items[0].endswith("+") else tuple(GRAANK.invert_symbol(x) for x in items)
 
         min_sup = self.thd_supp
         n = self.attr_size
@@ -78,82 +87,376 @@ class GRAANK(DataGP):
         if gi_dict is None:
             return {}, 0
 
-        all_candidates = []
+        # 1. Group the itemsets by prefix (all but their last item)
+        join_col = target_col if (target_col is not None) and (not exclude_target) else None
+        is_item_level = True
+        prefix_groups: dict[tuple[str, ...], list[tuple[str, str | tuple]]] = {}
+        valid_keys = set()
+        for gi_key in gi_dict.keys():
+            items = (gi_key,) if isinstance(gi_key, str) else tuple(gi_key)
+            is_item_level = is_item_level and isinstance(gi_key, str)
+            if exclude_target and (target_col is not None) and any(get_col(x) == target_col for x in items):
+                continue
+            valid_keys.add(DataGP.get_pattern_key(items))
+            join_items = get_join_form(items)
+            if is_item_level and not gi_key.endswith("+"):
+                # Both variations of a gradual item are joined as the last item of a candidate
+                prefix_groups.setdefault((), []).append((gi_key, gi_key))
+                continue
+            prefix_groups.setdefault(join_items[:-1], []).append((join_items[-1], gi_key))
+
         invalid_count = 0
         res_dict = {}
+        candidates = set()
+        for prefix, group in prefix_groups.items():
+            group.sort(key=lambda x: (get_col(x[0]) != join_col, get_col(x[0]), x[0]))
+            for i in range(len(group)):
+                last_i, gi_key_i = group[i]
+                if is_item_level and not last_i.endswith("+"):
+                    continue
+                for j in range(i + 1, len(group)):
+                    last_j, gi_key_j = group[j]
+                    if get_col(last_i) == get_col(last_j):
+                        # A GP never holds two items of the same attribute
+                        continue
 
-        gi_key_list = list(gi_dict.keys())
-        for i in range(len(gi_dict) - 1):
-            for j in range(i + 1, len(gi_dict)):
-                # 1. Fetch pairwise matrix
-                gi_str_i = gi_key_list[i]
-                gi_str_j = gi_key_list[j]
-
-                """
-                TO DELETE
-                try:
-                    gi_i = {list(gi_str_i) if isinstance(gi_str_i, tuple) else gi_str_i}
-                    gi_j = {gi_str_j}
-                    gi_o = {gi_key_list[0]}
-                except TypeError:
-                    gi_i = set(list(gi_str_i) if isinstance(gi_str_i, tuple) else gi_str_i)
-                    gi_j = set(list(gi_str_j) if isinstance(gi_str_j, tuple) else gi_str_j)
-                    gi_o = set(gi_key_list[0])
-                """
-                if isinstance(gi_str_i, (tuple, list)):
-                    gi_i = set(gi_str_i)
-                    gi_o = set(gi_key_list[0])
-                else:
-                    gi_i = {gi_str_i}
-                    gi_o = {gi_key_list[0]}
-
-                if isinstance(gi_str_j, (tuple, list)):
-                    gi_j = set(gi_str_j)
-                else:
-                    gi_j = {gi_str_j}
+                    # 2. Identify a GP candidate (a hash set drops duplicates, including inverse candidates)
+                    join_items = prefix + (last_i, last_j)
+                    gp_key = DataGP.get_pattern_key(join_items)
+                    if gp_key in candidates:
+                        continue
+                    candidates.add(gp_key)
 
-                # 2. Identify a GP candidate (create its inverse)
-                gp_cand = gi_i | gi_j
-                inv_gp_cand = {invert_symbol(x) for x in gp_cand}
+                    # 3. Apply target-feature search
+                    if (join_col is not None) and (get_col(join_items[0]) != join_col):
+                        continue
 
-                # 3. Apply target-feature search
-                if target_col is not None:
-                    has_tgt_col = np.any(np.array([(GI.from_string(gi_str).attribute_col == target_col) for gi_str in gp_cand], dtype=bool))
-                    # (ONLY proceed if target-feature is NOT part of the GP candidate - exclude_target is True)
-                    if exclude_target and has_tgt_col:
+                    # 4. Prune the candidate if any of its subsets is not valid (anti-monotonicity); the subsets without
+                    # the last or the second-to-last item are the joined itemsets
+                    is_pruned = False
+                    for k in range(len(join_items) - 2):
+                        if (join_col is not None) and (k == 0):
+                            continue
+                        if DataGP.get_pattern_key(join_items[:k] + join_items[k + 1:]) not in valid_keys:
+                            is_pruned = True
+                            break
+                    if is_pruned:
                         continue
-                    # (ONLY proceed if target-feature is part of the GP candidate - exclude_target is False)
-                    elif (not exclude_target) and (not has_tgt_col):
+
+                    # 5. Validate GP and save it
+                    if (max_supports is not None) and (not ignore_sup) and (max_supports.get(gp_key, 1) <= min_sup):
+                        invalid_count += 1
                         continue
+                    if self.support_engine is not None:
+                        # Matrix-free support (no bitmap is produced)
+                        res_pw_mat = PairwiseMatrix(bin_mat=None, support=self.support_engine.support(gp_key))
+                    else:
+                        # (streamed into a scratch file if the bitmaps are memory-mapped, see store_dir)
+                        res_pw_mat = self._and_itemsets(gi_dict, gp_key, gi_key_i, gi_key_j)
+                    if supports is not None:
+                        supports[gp_key] = res_pw_mat.support
+                    if track:
+                        self.track_pattern(gp_key, res_pw_mat.support)
+                    is_valid = res_pw_mat.support > min_sup or ignore_sup
+                    if is_valid and (top_k is not None):
+                        is_valid = GRAANK.push_top_support(top_supports, res_pw_mat.support, top_k)
+                    if is_valid:
+                        res_dict[gp_key] = res_pw_mat
+                    else:
+                        invalid_count += 1
+        return res_dict, invalid_count
 
-                # 4. Verify the validity of the GP candidate through the following conditions
-                is_length_valid = (len(gp_cand) == len(gi_o) + 1)
-                is_unique_candidate = ((not (all_candidates != [] and gp_cand in all_candidates)) and
-                                    (not (all_candidates != [] and inv_gp_cand in all_candidates)))
-
-                # 4. Validate GP and save it
-                if is_length_valid and is_unique_candidate:
-                    test = 1
-                    repeated_attr = -1
-                    for k in gp_cand:
-                        if k[0] == repeated_attr:
-                            test = 0
-                            break
-                        else:
-                            repeated_attr = k[0]
-                    if test == 1:
-                        res_pw_mat: PairwiseMatrix = GP.perform_and(gi_dict[gi_str_i], gi_dict[gi_str_j], n)
-                        if res_pw_mat.support > min_sup or ignore_sup:
-                            # res_dict.append([gp_cand, bin_mat, sup])
-                            res_dict[tuple(gp_cand)] = res_pw_mat
+    def _and_itemsets(self, gi_dict: dict, gp_key: tuple[str, ...], gi_key_i, gi_key_j) -> PairwiseMatrix:
+        """
+        Computes the pairwise matrix of a GP candidate through the AND of the matrices of two of its subsets. A subset
+        that is stored in the inverse orientation (w.r.t. the candidate) is read through its transpose.
+
+        :param gi_dict: GP keys together with their bitmaps.
+        :param gp_key: The canonical key of the GP candidate.
+        :param gi_key_i: Key (in gi_dict) of the first subset.
+        :param gi_key_j: Key (in gi_dict) of the second subset.
+        :return: The pairwise matrix of the candidate (in the orientation of gp_key)
+        """
+        bitmaps = []
+        for gi_key in (gi_key_i, gi_key_j):
+            pw_mat = gi_dict[gi_key]
+            first_item = gi_key if isinstance(gi_key, str) else gi_key[0]
+            bitmaps.append(pw_mat if first_item in gp_key else pw_mat.inverse())
+        return GP.perform_and(bitmaps[0], bitmaps[1], self.attr_size, out=self.allocate_bitmap())
+
+    @staticmethod
+    def invert_symbol(gi_item: str) -> str:
+        """
+        Computes the inverse of a GI formatted as a string.
+
+        :param gi_item: gradual item as a string (e.g., '1+' or '1-')
+        :return: inverted gradual item
+        """
+        if gi_item.endswith("+"):
+            return gi_item[:-1] + "-"
+        elif gi_item.endswith("-"):
+            return gi_item[:-1] + "+"
+        else:
+            return gi_item
+
+    @staticmethod
+    def push_top_support(top_supports: list[float], support: float, top_k: int) -> bool:
+        """
+        Pushes the support of a valid GP into a min-heap that holds the K best supports found so far. Once the heap is
+        full, its root (the K-th best support) is the effective support threshold: a GP with a lower support is
+        rejected, and so are its supersets (anti-monotonicity).
+
+        :param top_supports: Min-heap of the K best supports
+        :param support: Support of the GP
+        :param top_k: Number of supports (K) held by the heap
+        :return: False if the support is lower than the K-th best support, True otherwise
+        """
+        if len(top_supports) < top_k:
+            heapq.heappush(top_supports, support)
+        elif support >= top_supports[0]:
+            heapq.heappushpop(top_supports, support)
+        else:
+            return False
+        return True
+
+    def _discover_dfs(self, ignore_support: bool = False, apriori_level: int | None = None,
+                      target_col: int | None = None, exclude_target: bool = False, mode: str = 'maximal',
+                      top_k: int | None = None, top_supports: list[float] | None = None):
+        """
+        Walks the itemset lattice depth-first (Eclat-style): a GP is extended with the valid extensions of its parent
+        that follow its last gradual item, and the bitmap of every extension is the AND of the bitmap of the GP with the
+        bitmap of the item. An extension that is not frequent is not extended further (anti-monotonicity). Only the
+        bitmaps along the current path are alive (one scratch bitmap per depth), so the memory is bounded by
+        depth × n² bits instead of the width of a level.
+
+        Branches that cannot hold a pattern of the requested mode are pruned during the search:
+            - an extension with the same pair count as the GP (the GP's pairs are a subset of the item's pairs) is
+              absorbed into the GP, since every closed or maximal GP of the branch contains it;
+            - (maximal) if the GP extended with all its valid extensions is frequent, it is the only maximal GP of the
+              branch (look-ahead), and a branch whose union is a subset of a maximal GP found earlier is skipped.
+
+        The absorption is not applied if apriori_level is set (it may exceed the level). If top_k is set, the support
+        threshold is raised as the K best supports are found (see push_top_support) and every valid GP is returned: the
+        mode is applied once the final threshold is known, so the branches are not pruned on the mode. Every evaluated,
+        absorbed or returned GP is tracked (see track_pattern), so that append_rows keeps the returned GPs up to date.
+
+        :param ignore_support: Do not filter extracted GPs using a user-defined minimum support threshold.
+        :param apriori_level: Maximum APRIORI level for generating candidates.
+        :param target_col: Target feature's column index.
+        :param exclude_target: Only accept GP candidates that do not contain the target feature.
+        :param mode: 'maximal' or 'closed' GPs.
+        :param top_k: [optional] only accept the GPs whose support is among the K best supports.
+        :param top_supports: Min-heap of the K best supports, required with top_k.
+        :return: The keys of the GPs together with their pair counts, and the invalid count.
+        """
+        gi_dict = self.valid_bins
+        if gi_dict is None:
+            return [], 0
+        min_sup = self.thd_supp
+        n = self.attr_size
+        max_size = None if apriori_level is None else max(apriori_level, 2)
+        pair_total = n * (n - 1.0) / 2.0
+
+        # The attributes in join order: the target attribute first if it must be part of every GP
+        join_col = target_col if (target_col is not None) and (not exclude_target) else None
+        attr_cols = sorted((col for col in gi_dict.attr_cols if not (exclude_target and col == target_col)),
+                           key=lambda col: (col != join_col, col))
+        if (join_col is not None) and (join_col not in attr_cols):
+            return [], 0
+        root_cols = attr_cols[:1] if join_col is not None else attr_cols
+
+        scratch_bitmaps = []
+        found_gps: list[tuple[tuple[str, ...], int]] = []
+        item_index: dict[str, set[int]] = {}
+        invalid_count = 0
+
+        def get_scratch_bitmap(depth: int) -> np.ndarray:
+            """Returns the (reused) scratch bitmap of a depth of the path"""
+            while len(scratch_bitmaps) <= depth:
+                out = self.allocate_bitmap()
+                if out is None:
+                    shape, dtype = DataGP.get_bitmap_layout(n, self.packed)
+                    out = np.empty(shape, dtype=dtype)
+                scratch_bitmaps.append(out)
+            return scratch_bitmaps[depth]
+
+        def and_item(pw_mat: PairwiseMatrix | None, items: tuple[str, ...], gi_str: str) -> PairwiseMatrix:
+            """Computes the pairwise matrix (or only the support) of a GP extended with a gradual item"""
+            if self.support_engine is not None:
+                return PairwiseMatrix(bin_mat=None, support=self.support_engine.support(items + (gi_str,)))
+            return GP.perform_and(pw_mat, gi_dict[gi_str], n, out=get_scratch_bitmap(len(items)))
+
+        def is_valid(support: float) -> bool:
+            return support > min_sup or ignore_support
+
+        def push_extension(support: float) -> bool:
+            if not is_valid(support):
+                return False
+            return (top_k is None) or GRAANK.push_top_support(top_supports, support, top_k)
+
+        def is_covered(items: tuple[str, ...]) -> bool:
+            """Checks if a GP (in either orientation) is a subset of a maximal GP found earlier"""
+            for gi_strs in (items, tuple(self.invert_symbol(gi_str) for gi_str in items)):
+                gp_ids = None
+                for gi_str in gi_strs:
+                    gp_ids = item_index.get(gi_str, set()) if gp_ids is None else gp_ids & item_index.get(gi_str, set())
+                    if not gp_ids:
+                        break
+                if gp_ids:
+                    return True
+            return False
+
+        def add_gp(items: tuple[str, ...], pair_count: int):
+            gp_key = DataGP.get_pattern_key(items)
+            self.track_pattern(gp_key, pair_count / pair_total)
+            if (mode == 'maximal') and (top_k is None):
+                for gi_str in gp_key:
+                    item_index.setdefault(gi_str, set()).add(len(found_gps))
+            found_gps.append((gp_key, pair_count))
+
+        def extend(items: tuple[str, ...], pair_count: int, pw_mat: PairwiseMatrix | None, tail: list[str]):
+            """
+            Visits a GP and its extensions (depth-first).
+
+            :param items: Gradual items of the GP
+            :param pair_count: Pair count of the GP
+            :param pw_mat: Pairwise matrix of the GP (None if the 'rank' engine is used)
+            :param tail: Gradual items that may extend the GP
+            """
+            nonlocal invalid_count
+            # 1. Evaluate the extensions of the GP
+            extensions: list[tuple[str, int]] = []
+            for gi_str in tail:
+                res_pw_mat = and_item(pw_mat, items, gi_str)
+                self.track_pattern(DataGP.get_pattern_key(items + (gi_str,)), res_pw_mat.support)
+                if push_extension(res_pw_mat.support):
+                    extensions.append((gi_str, round(res_pw_mat.support * pair_total)))
+                else:
+                    invalid_count += 1
+
+            # 2. Absorb the extensions that keep all the pairs of the GP (the opposite item must not be valid)
+            if (max_size is None) and (top_k is None):
+                valid_items = {gi_str for gi_str, _ in extensions}
+                absorbed = tuple(gi_str for gi_str, count in extensions
+                                 if count == pair_count and self.invert_symbol(gi_str) not in valid_items)
+                if absorbed:
+                    items = items + absorbed
+                    self.track_pattern(items, pair_count / pair_total)
+                    extensions = [(gi_str, count) for gi_str, count in extensions if gi_str not in absorbed]
+
+            # 3. Report the GP or prune the branch
+            if top_k is not None:
+                if len(items) >= 2:
+                    add_gp(items, pair_count)
+            elif mode == 'maximal':
+                if not extensions:
+                    if len(items) >= 2 and not is_covered(items):
+                        add_gp(items, pair_count)
+                    return
+                ext_cols = [GI.from_string(gi_str).attribute_col for gi_str, _ in extensions]
+                if len(set(ext_cols)) == len(ext_cols) and (max_size is None or len(items) + len(ext_cols) <= max_size):
+                    # Look-ahead: the union of the GP with all its valid extensions
+                    union_items = items + tuple(gi_str for gi_str, _ in extensions)
+                    if is_covered(union_items):
+                        return
+                    if len(extensions) > 1:
+                        res_pw_mat = pw_mat
+                        for k, (gi_str, _) in enumerate(extensions):
+                            res_pw_mat = and_item(res_pw_mat, union_items[:len(items) + k], gi_str)
+                            self.track_pattern(union_items[:len(items) + k + 1], res_pw_mat.support)
+                            if not is_valid(res_pw_mat.support):
+                                break
                         else:
-                            invalid_count += 1
-                    all_candidates.append(gp_cand)
-                    gc.collect()
-        return res_dict, invalid_count
+                            add_gp(union_items, round(res_pw_mat.support * pair_total))
+                            return
+            elif len(items) >= 2 and all(count != pair_count for _, count in extensions):
+                add_gp(items, pair_count)
+
+            # 4. Extend the GP with each valid extension, using the valid extensions that follow it
+            for k, (gi_str, count) in enumerate(extensions):
+                child_items = items + (gi_str,)
+                col = GI.from_string(gi_str).attribute_col
+                child_tail = [] if (max_size is not None and len(child_items) >= max_size) else \
+                    [ext_str for ext_str, _ in extensions[k + 1:] if GI.from_string(ext_str).attribute_col != col]
+                child_pw_mat = and_item(pw_mat, items, gi_str) if child_tail and (pw_mat is not None) else None
+                extend(child_items, count, child_pw_mat, child_tail)
+
+        for i, col in enumerate(root_cols):
+            gi_str = f"{col}+"
+            root_tail = [f"{tail_col}{symbol}" for tail_col in attr_cols[i + 1:] for symbol in ("+", "-")]
+            extend((gi_str,), round(gi_dict[gi_str].support * pair_total),
+                   gi_dict[gi_str] if self.support_engine is None else None, root_tail)
+        return found_gps, invalid_count
+
+    def _and_items(self, gp_key: tuple[str, ...]) -> PairwiseMatrix | None:
+        """
+        Computes the pairwise matrix of a GP through the AND of the bitmaps of its gradual items.
+
+        :param gp_key: Gradual items of the GP as strings
+        :return: The pairwise matrix of the GP (None if the bitmaps are not available)
+        """
+        if (self.valid_bins is None) or (self.support_engine is not None):
+            return None
+        pw_mat = self.valid_bins[gp_key[0]]
+        for gi_str in gp_key[1:]:
+            pw_mat = GP.perform_and(pw_mat, self.valid_bins[gi_str], self.attr_size, out=self.allocate_bitmap())
+        return pw_mat
+
+    @staticmethod
+    def _filter_patterns(gp_items: list[tuple[tuple[str, ...], int]], mode: str) -> list[int]:
+        """
+        Finds the maximal (not a subset of another GP) or closed (not a subset of another GP with the same pair count)
+        GPs of a list. The GPs are indexed by gradual item, so that the supersets of a GP are found through the
+        intersection of the indices of its items.
+
+        :param gp_items: Canonical keys of the GPs together with their pair counts
+        :param mode: 'maximal' or 'closed'
+        :return: Positions (in the list) of the maximal or closed GPs
+        """
+        item_index: dict[tuple[str, int], set[int]] = {}
+        for pos, (gp_key, count) in enumerate(gp_items):
+            for gi_str in gp_key:
+                item_index.setdefault((gi_str, count if mode == 'closed' else 0), set()).add(pos)
+
+        kept = []
+        for pos, (gp_key, count) in enumerate(gp_items):
+            is_kept = True
+            for gi_strs in (gp_key, tuple(GRAANK.invert_symbol(gi_str) for gi_str in gp_key)):
+                gp_ids = None
+                for gi_str in gi_strs:
+                    ids = item_index.get((gi_str, count if mode == 'closed' else 0), set())
+                    gp_ids = ids if gp_ids is None else gp_ids & ids
+                    if not gp_ids:
+                        break
+                if gp_ids and any(len(gp_items[i][0]) > len(gp_key) for i in gp_ids):
+                    is_kept = False
+                    break
+            if is_kept:
+                kept.append(pos)
+        return kept
+
+    def _create_gp(self, gp_set, gi_data: PairwiseMatrix, compute_descriptors: bool = True) -> GP:
+        """
+        Creates a GP object from the key of a valid GP candidate and its pairwise matrix.
+
+        :param gp_set: Gradual items of the GP as strings
+        :param gi_data: Pairwise matrix of the GP
+        :param compute_descriptors: Compute the descriptors of the GP (if the pairwise matrix is available)
+        :return: GP object
+        """
+        gp: GP = GP()
+        for gi_str in gp_set:
+            gi: GI = GI.from_string(gi_str)
+            gp.add_gradual_item(gi)
+        gp.support = gi_data.support
+        if compute_descriptors and (gi_data.bin_mat is not None):
+            warping_set_arr: np.ndarray = np.array(DataGP.gen_gradual_warping_set(gi_data.to_dense(), as_array=True))
+            gp.compute_descriptors(warping_set_arr, obj_count=self.row_count)
+        return gp
 
     def discover(self, ignore_support: bool = False, apriori_level: int | None = None,
-                 target_col: int | None = None, exclude_target: bool = False, compute_descriptors: bool = True):
+                 target_col: int | None = None, exclude_target: bool = False, compute_descriptors: bool = True,
+                 strategy: str = 'bfs', mode: str = 'maximal', top_k: int | None = None):
         """
         Uses apriori algorithm to find gradual pattern (GP) candidates. The candidates are validated if their computed
         support is greater than or equal to the minimum support threshold specified by the user.
@@ -162,38 +465,95 @@ class GRAANK(DataGP):
         :param apriori_level: Maximum APRIORI level for generating candidates.
         :param target_col: Target feature's column index.
         :param exclude_target: Only accept GP candidates that do not contain the target feature.
-        :param compute_descriptors: [optional] compute descriptors for each GP candidate.
+        :param compute_descriptors: [optional] compute descriptors for each GP candidate (requires the 'bitmap'
+        engine, since the descriptors are derived from the pairwise matrix).
+        :param strategy: [optional] 'bfs' (default) generates the candidates level by level; 'dfs' walks the itemset
+        lattice depth-first and only keeps the bitmaps along the current path (see _discover_dfs). Both strategies
+        return the same patterns.
+        :param mode: [optional] 'maximal' (default) returns the GPs that are not a subset of another valid GP; 'closed'
+        returns the GPs that have no superset with the same support. The depth-first strategy prunes the branches that
+        cannot hold such GPs.
+        :param top_k: [optional] find the K strongest GPs in one pass: the minimum support is only the starting
+        threshold, which is raised to the K-th best support as the GPs are found (candidates below it are pruned). The
+        patterns (see mode) of the GPs whose support is at least the final threshold are returned, sorted by support.
 
         :return: JSON object
         """
+        if strategy not in ('bfs', 'dfs'):
+            raise ValueError("Invalid strategy. It should be either 'bfs' or 'dfs'.")
+        if mode not in ('maximal', 'closed'):
+            raise ValueError("Invalid mode. It should be either 'maximal' or 'closed'.")
+        if (top_k is not None) and top_k < 1:
+            raise ValueError("Invalid top_k. It should be a positive integer.")
 
         start = time.time()
         self.fit_bitmap()
         self.clear_gradual_patterns()
-        valid_bins_dict: dict|None = copy.deepcopy(self.valid_bins)
+        pair_total = self.attr_size * (self.attr_size - 1.0) / 2.0
+        top_supports: list[float] = []
+        found_gps: list[tuple[tuple[str, ...], int]] | None = None
+        if strategy == 'dfs':
+            found_gps, invalid_count = self._discover_dfs(ignore_support=ignore_support, apriori_level=apriori_level,
+                                                          target_col=target_col, exclude_target=exclude_target,
+                                                          mode=mode, top_k=top_k, top_supports=top_supports)
+        else:
+            # A shallow copy: the bitmaps are only read, and a deep copy would materialize every transposed item
+            valid_bins_dict: dict|ValidBins|None = self.valid_bins.copy() if self.valid_bins is not None else None
 
-        invalid_count = 0
-        candidate_level = 1
-        while valid_bins_dict:
-            valid_bins_dict, inv_count = self._gen_apriori_candidates(valid_bins_dict,
-                                                                 ignore_sup=ignore_support,
-                                                                 target_col=target_col,
-                                                                 exclude_target=exclude_target)
-            invalid_count += inv_count
-            for gp_set, gi_data in (valid_bins_dict or {}).items():
-                self.remove_subsets(set(gp_set))
-                gp: GP = GP()
-                for gi_str in gp_set:
-                    gi: GI = GI.from_string(gi_str)
-                    gp.add_gradual_item(gi)
-                gp.support = gi_data.support
-                if compute_descriptors:
-                    warping_set_arr: np.ndarray = np.array(DataGP.gen_gradual_warping_set(gi_data.bin_mat, as_array=True))
-                    gp.compute_descriptors(warping_set_arr, obj_count=self.row_count)
-                self.add_gradual_pattern(gp)
-            candidate_level += 1
-            if (apriori_level is not None) and candidate_level >= apriori_level:
-                break
+            invalid_count = 0
+            candidate_level = 1
+            level_dict: dict = {}
+            found_gps = [] if top_k is not None else None
+            while valid_bins_dict:
+                valid_bins_dict, inv_count = self._gen_apriori_candidates(valid_bins_dict,
+                                                                     ignore_sup=ignore_support,
+                                                                     target_col=target_col,
+                                                                     exclude_target=exclude_target,
+                                                                     track=True, top_k=top_k,
+                                                                     top_supports=top_supports)
+                invalid_count += inv_count
+                candidate_level += 1
+                if found_gps is not None:
+                    # The patterns are only known once the final threshold is
+                    found_gps.extend((gp_set, round(gi_data.support * pair_total))
+                                     for gp_set, gi_data in (valid_bins_dict or {}).items())
+                    if (apriori_level is not None) and candidate_level >= apriori_level:
+                        break
+                    continue
+
+                # The GPs of the previous level are kept if they have no valid (k+1)-superset with the same pair count
+                # (closed), or no valid (k+1)-superset at all (maximal)
+                superset_counts: dict[tuple[str, ...], int] = {}
+                for gp_set, gi_data in (valid_bins_dict or {}).items():
+                    count = round(gi_data.support * pair_total)
+                    for i in range(len(gp_set)):
+                        sub_key = DataGP.get_pattern_key(gp_set[:i] + gp_set[i + 1:])
+                        superset_counts[sub_key] = max(count, superset_counts.get(sub_key, -1))
+                for gp_set, gi_data in level_dict.items():
+                    if mode == 'maximal' and gp_set in superset_counts:
+                        continue
+                    if mode == 'closed' and superset_counts.get(gp_set) == round(gi_data.support * pair_total):
+                        continue
+                    self.add_gradual_pattern(self._create_gp(gp_set, gi_data, compute_descriptors))
+                level_dict = valid_bins_dict or {}
+                if (apriori_level is not None) and candidate_level >= apriori_level:
+                    for gp_set, gi_data in level_dict.items():
+                        self.add_gradual_pattern(self._create_gp(gp_set, gi_data, compute_descriptors))
+                    break
+
+        if found_gps is not None:
+            if (top_k is not None) and (len(top_supports) == top_k):
+                # Drop the GPs that were accepted before the threshold reached the K-th best support
+                min_count = round(top_supports[0] * pair_total)
+                found_gps = [(gp_key, count) for gp_key, count in found_gps if count >= min_count]
+            if top_k is not None:
+                found_gps.sort(key=lambda x: -x[1])
+            for pos in GRAANK._filter_patterns(found_gps, mode):
+                gp_key, pair_count = found_gps[pos]
+                gi_data = self._and_items(gp_key) if compute_descriptors else None
+                if gi_data is None:
+                    gi_data = PairwiseMatrix(bin_mat=None, support=pair_count / pair_total)
+                self.add_gradual_pattern(self._create_gp(gp_key, gi_data, compute_descriptors))
 
         duration = time.time() - start
         out_dict: dict[str, str|list]= {
@@ -203,5 +563,7 @@ class GRAANK(DataGP):
         self.generate_output_files(out_dict, target_col=target_col)
 
         out_dict.update({"Patterns": self.display_patterns, "Invalid Count": str(invalid_count)})
+        if (top_k is not None) and top_supports:
+            out_dict["Top-k Support"] = str(round(top_supports[0], 3))
         out: object = json.dumps(out_dict,indent=4)
         return out
@@ -77,9 +77,13 @@ class AntGRAANK(DataGP):
                 else:
                     if gi_dict is None:
                         continue
-                    res_pw_mat: PairwiseMatrix = GP.perform_and(gi_dict[attr_keys[i]], gi_dict[attr_keys[j]], n)
+                    if gi_dict.support_engine is not None:
+                        d[i][j] += gi_dict.support_engine.count([attr_keys[i], attr_keys[j]])
+                        continue
+                    res_pw_mat: PairwiseMatrix = GP.perform_and(gi_dict[attr_keys[i]], gi_dict[attr_keys[j]], n,
+                                                                out=self.allocate_bitmap())
                     # Cumulative sum of all segments for 2x2 (all attributes) gradual items
-                    d[i][j] += np.sum(res_pw_mat.bin_mat)
+                    d[i][j] += res_pw_mat.count()
         # print(d)
         self._distance_matrix = d
         self._attribute_keys: list[str] = attr_keys
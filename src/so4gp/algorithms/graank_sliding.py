@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GNU GPL v3
+# This file is licensed under the terms of the GNU GPL v3.0.
+# See the LICENSE file at the root of this
+# repository for complete details.
+
+import numpy as np
+from ..data_gp import DataGP
+from ..gradual_patterns import GI, GP, PairwiseMatrix, ValidBins
+from .graank import GRAANK
+
+
+class SlidingGRAANK(GRAANK):
+
+    def __init__(self, *args, window_size: int = 100, **kwargs):
+        """
+        Extracts gradual patterns (GPs) from the most recent objects of a data stream: a sliding window of window_size
+        objects. The patterns of the first window are extracted by GRAANK (see discover); after that, every new object
+        slides the window (see slide) and the pattern set is maintained incrementally instead of being mined again.
+
+        The bitmaps of all the attributes are kept in window_size×window_size buffers whose rows and columns are
+        object slots: a new object takes the slot of the expired (oldest) object, so a slide only recomputes one row
+        and one column of every bitmap (O(W) work per attribute). The pair counts of the frequent patterns and of their
+        candidate supersets (the negative border) are updated with the pairs of the expired and the new object
+        (O(W·k) work per pattern). Only when a pattern crosses the minimum support threshold is the candidate lattice
+        extended: the new candidates are evaluated once over the window bitmaps.
+
+        The object order inside the window follows the slots (the supports of gradual patterns do not depend on it),
+        so the descriptors of the patterns are only computed by discover.
+
+        :param args: [required] data source path of Pandas DataFrame, [optional] minimum-support, [optional] eq
+        :param window_size: [optional] number of objects in the window, the default is 100. If the data source has more
+        objects, only the last window_size objects are kept.
+
+        >>> from so4gp.algorithms import SlidingGRAANK
+        >>> import pandas
+        >>>
+        >>> dummy_data = [[8, 1, 2, 3], [2, 8, 8, 6], [1, 1, 3, 4], [6, 5, 3, 2], [7, 7, 1, 2], [5, 4, 8, 5], [4, 4, 6, 6]]
+        >>> dummy_df = pandas.DataFrame(dummy_data, columns=['A', 'B', 'C', 'D'])
+        >>>
+        >>> mine_obj = SlidingGRAANK(data_source=dummy_df, min_sup=0.5, window_size=7)
+        >>> result_json = mine_obj.discover()
+        >>> [(gp.to_string(), gp.support) for gp in mine_obj.gradual_patterns]
+        [(['0+', '2-', '3-'], 0.524)]
+        >>> deltas = mine_obj.slide([[2, 7, 7, 9], [9, 1, 1, 1]])
+        >>> sorted((gp.to_string(), gp.support) for gp in mine_obj.gradual_patterns)
+        [(['0+', '2-', '3-'], 0.619), (['1+', '3+'], 0.524)]
+        """
+        super(SlidingGRAANK, self).__init__(*args, **kwargs)
+        if window_size < 2:
+            raise ValueError("The window size should be at least 2.")
+        if self.packed or (self.engine != 'bitmap') or (self.store_dir is not None):
+            raise ValueError("SlidingGRAANK requires unpacked in-memory bitmaps (engine='bitmap', packed=False).")
+        self._window_size: int = int(window_size)
+        self._next_slot: int = 0
+        self._window_gps: dict[tuple[str, ...], GP] = {}
+        if self._row_count > self._window_size:
+            # Keep the most recent objects
+            keep = slice(self._row_count - self._window_size, None)
+            self._attr_data = np.ascontiguousarray(self._attr_data[:, keep])
+            self._time_data = np.ascontiguousarray(self._time_data[:, keep])
+            if self._data is not None:
+                self._data = self._data[keep]
+            else:
+                self._time_values = [time_values[keep] for time_values in self._time_values]
+            self._row_count = self._window_size
+
+    @property
+    def window_size(self) -> int:
+        return self._window_size
+
+    def fit_bitmap(self, attr_data=None) -> None:
+        """
+        Builds the bitmaps of all the attribute columns of the window into window_size×window_size buffers (so that
+        slide can update them in place) and stores the valid ones in valid_bins.
+
+        :param attr_data: Stepped attribute objects (one row or view per column), the default is the window
+        :type attr_data: np.ndarray | list[np.ndarray] | None
+        :return: void
+        """
+        if attr_data is not None:
+            super(SlidingGRAANK, self).fit_bitmap(attr_data)
+            return
+        n = self._row_count
+        self._attr_size = n
+        self._pattern_counts = {}
+        self._bitmap_buffers = {}
+        for col in self._attr_cols:
+            buffer = np.zeros((self._window_size, self._window_size), dtype=bool)
+            _, pair_count = DataGP.build_bitmap(DataGP.as_float(self._attr_data[col]), eq=self._include_equal_values,
+                                                out=buffer[:n, :n])
+            self._bitmap_buffers[int(col)] = buffer
+            self._pattern_counts[(f"{col}+",)] = int(pair_count)
+        self._set_valid_bins()
+
+    def discover(self, ignore_support: bool = False, apriori_level: int | None = None,
+                 target_col: int | None = None, exclude_target: bool = False, compute_descriptors: bool = True):
+        """
+        Extracts the gradual patterns of the current window (see GRAANK.discover) and prepares the candidate lattice
+        that slide maintains. The window patterns are always mined with the support threshold, at all the levels and
+        without a target feature.
+
+        :param ignore_support: Not supported (it must be False).
+        :param apriori_level: Not supported (it must be None).
+        :param target_col: Not supported (it must be None).
+        :param exclude_target: Not supported (it must be False).
+        :param compute_descriptors: [optional] compute descriptors for each GP.
+        :return: JSON object
+        """
+        if ignore_support or (apriori_level is not None) or (target_col is not None) or exclude_target:
+            raise ValueError("SlidingGRAANK only mines all the frequent patterns of the window.")
+        out = super(SlidingGRAANK, self).discover(compute_descriptors=compute_descriptors)
+        # The extracted patterns (with their descriptors) form the initial pattern set
+        self._window_gps = {DataGP.get_pattern_key(gp.to_string()): gp for gp in self.gradual_patterns}
+        self._update_lattice()
+        return out
+
+    def slide(self, rows) -> list[dict]:
+        """
+        Inserts new objects into the window; once the window is full, every new object expires the oldest one. The
+        pattern set (the maximal frequent patterns) is updated after every object and the changes are reported.
+
+        :param rows: New objects with the columns of the dataset (a DataFrame with the same titles, or a 2-D array)
+        :type rows: pd.DataFrame | np.ndarray | list
+        :return: A list with the delta of every slide: the patterns added to and removed from the pattern set
+        """
+        if not self._bitmap_buffers:
+            # The first window was not mined yet
+            self.discover(compute_descriptors=False)
+        new_data, new_attr, new_time = self._parse_rows(rows)
+        deltas = []
+        for k in range(new_data.shape[0]):
+            self._slide_row(new_data[k], new_attr[:, k], new_time[:, k])
+            deltas.append(self._update_lattice())
+        return deltas
+
+    def append_rows(self, rows) -> list[dict]:
+        """
+        Slides the window by the new objects (see slide).
+
+        :param rows: New objects with the columns of the dataset (a DataFrame with the same titles, or a 2-D array)
+        :return: A list with the delta of every slide
+        """
+        return self.slide(rows)
+
+    def _slide_row(self, row_data: np.ndarray, row_attr: np.ndarray, row_time: np.ndarray) -> None:
+        """
+        Puts one object into the window: it takes the slot of the oldest object if the window is full (the pairs of
+        the expired object are subtracted from the pair counts), otherwise a new slot. Only the row and the column of
+        the slot are recomputed in every bitmap.
+
+        :param row_data: The object (one value per column)
+        :param row_attr: Its attribute values
+        :param row_time: Its epochs
+        :return: void
+        """
+        eq = self._include_equal_values
+        gi_lists = {gp_key: [GI.from_string(gi_str) for gi_str in gp_key] for gp_key in self._pattern_counts}
+        n = self._row_count
+        if n < self._window_size:
+            # The window is filling up
+            slot = n
+            self._attr_data = np.concatenate((self._attr_data, row_attr[:, np.newaxis]), axis=1)
+            self._time_data = np.concatenate((self._time_data, row_time[:, np.newaxis]), axis=1)
+            if self._data is not None:
+                self._data = np.vstack((self._data, row_data[np.newaxis]))
+            else:
+                self._time_values = [np.append(self._time_values[k], row_data[col])
+                                     for k, col in enumerate(self._time_cols)]
+            n += 1
+            self._row_count = n
+        else:
+            # The new object replaces the oldest one
+            slot = self._next_slot
+            self._next_slot = (slot + 1) % self._window_size
+            for gp_key, gi_list in gi_lists.items():
+                self._pattern_counts[gp_key] -= DataGP.count_pairs(self._attr_data, gi_list, slot, slot + 1, eq=eq)
+            self._attr_data[:, slot] = row_attr
+            self._time_data[:, slot] = row_time
+            if self._data is not None:
+                self._data[slot] = row_data
+            else:
+                for k, col in enumerate(self._time_cols):
+                    self._time_values[k][slot] = row_data[col]
+
+        for gp_key, gi_list in gi_lists.items():
+            self._pattern_counts[gp_key] += DataGP.count_pairs(self._attr_data, gi_list, slot, slot + 1, eq=eq)
+        with np.errstate(invalid='ignore'):
+            for col, buffer in self._bitmap_buffers.items():
+                col_data = DataGP.as_float(self._attr_data[col])
+                bin_mat = buffer[:n, :n]
+                if not eq:
+                    np.greater(col_data, col_data[slot], out=bin_mat[slot])
+                    np.greater(col_data[slot], col_data, out=bin_mat[:, slot])
+                else:
+                    np.greater_equal(col_data, col_data[slot], out=bin_mat[slot])
+                    np.greater_equal(col_data[slot], col_data, out=bin_mat[:, slot])
+                    bin_mat[slot, slot] = False
+        self._attr_size = n
+        self._fingerprint = None
+        self._warping_set = None
+
+    def _set_valid_bins(self) -> None:
+        """Stores the window bitmaps of the frequent gradual items in valid_bins."""
+        n = self._row_count
+        self._valid_bins = ValidBins()
+        for col, buffer in self._bitmap_buffers.items():
+            supp = self._get_support(self._pattern_counts[(f"{col}+",)])
+            if supp >= self._thd_supp:
+                self._valid_bins.add(col, PairwiseMatrix(bin_mat=buffer[:n, :n], support=supp))
+        if len(self._valid_bins) < 3:
+            self._valid_bins = None
+
+    def _get_support(self, pair_count: int) -> float:
+        """Returns the support of a pair count in the current window."""
+        n = self._row_count
+        return float(pair_count) / float(n * (n - 1.0) / 2.0) if n > 1 else 0.0
+
+    def _count_window_pairs(self, gp_key: tuple[str, ...]) -> int:
+        """
+        Counts the object pairs of the window that respect a pattern through the AND of its window bitmaps.
+
+        :param gp_key: Pattern key (see DataGP.get_pattern_key)
+        :return: Number of concordant object pairs
+        """
+        n = self._row_count
+        bin_mat = np.ones((n, n), dtype=bool)
+        for gi_str in gp_key:
+            gi = GI.from_string(gi_str)
+            col_mat = self._bitmap_buffers[gi.attribute_col][:n, :n]
+            bin_mat &= col_mat if gi.symbol == "+" else col_mat.T
+        return int(np.count_nonzero(bin_mat))
+
+    def _update_lattice(self) -> dict:
+        """
+        Rebuilds the frequent patterns of the window level by level from the tracked pair counts: the candidates of a
+        level are the Apriori joins of the frequent patterns of the level below (whose subsets are all frequent). Only
+        the candidates that are not tracked yet are counted over the window bitmaps; the tracked patterns that are no
+        longer candidates are dropped. The maximal frequent patterns form the pattern set.
+
+        :return: The patterns added to and removed from the pattern set
+        """
+        n = self._row_count
+        self._set_valid_bins()
+        item_cols = sorted(col for col in self._bitmap_buffers
+                           if self._get_support(self._pattern_counts[(f"{col}+",)]) >= self._thd_supp)
+        tracked = {(f"{col}+",): self._pattern_counts[(f"{col}+",)] for col in self._bitmap_buffers}
+
+        # 1. Level 2: pairs of frequent gradual items (the first item is increasing, see DataGP.get_pattern_key)
+        candidates = [(f"{a}+", f"{b}{sym}") for i, a in enumerate(item_cols) for b in item_cols[i + 1:]
+                      for sym in ("+", "-")]
+        all_frequent = []
+        while len(candidates) > 0:
+            frequent = set()
+            for gp_key in candidates:
+                pair_count = self._pattern_counts.get(gp_key)
+                if pair_count is None:
+                    pair_count = self._count_window_pairs(gp_key)
+                tracked[gp_key] = pair_count
+                if self._get_support(pair_count) > self._thd_supp:
+                    frequent.add(gp_key)
+            all_frequent.append(frequent)
+
+            # 2. Next level: join the patterns that share all but their last item, keep those whose subsets are frequent
+            candidates = []
+            sorted_keys = sorted(frequent, key=lambda key: [GI.from_string(gi_str).as_tuple for gi_str in key])
+            for i, key_i in enumerate(sorted_keys):
+                for key_j in sorted_keys[i + 1:]:
+                    if key_i[:-1] != key_j[:-1]:
+                        break
+                    if GI.from_string(key_i[-1]).attribute_col == GI.from_string(key_j[-1]).attribute_col:
+                        continue
+                    gp_key = key_i + (key_j[-1],)
+                    if all(DataGP.get_pattern_key(gp_key[:k] + gp_key[k + 1:]) in frequent
+                           for k in range(len(gp_key) - 1)):
+                        candidates.append(gp_key)
+        self._pattern_counts = tracked
+
+        # 3. Maximal frequent patterns (a pattern is dropped if it is a subset of a frequent pattern, in either
+        # orientation)
+        sub_keys = set()
+        for frequent in all_frequent[1:]:
+            for gp_key in frequent:
+                sub_keys.update(DataGP.get_pattern_key(gp_key[:k] + gp_key[k + 1:]) for k in range(len(gp_key)))
+        window_gps = {}
+        for frequent in all_frequent:
+            for gp_key in frequent:
+                if gp_key in sub_keys:
+                    continue
+                gp = self._window_gps.get(gp_key)
+                if gp is None:
+                    gp = GP()
+                    for gi_str in gp_key:
+                        gp.add_gradual_item(GI.from_string(gi_str))
+                gp.support = self._get_support(tracked[gp_key])
+                window_gps[gp_key] = gp
+
+        removed_gps = []
+        for gp_key, gp in self._window_gps.items():
+            if gp_key not in window_gps:
+                if gp_key in tracked:
+                    gp.support = self._get_support(tracked[gp_key])
+                removed_gps.append(gp)
+        delta = {"Window Size": n,
+                 "Added Patterns": [gp for gp_key, gp in window_gps.items() if gp_key not in self._window_gps],
+                 "Removed Patterns": removed_gps}
+        self._window_gps = window_gps
+        if len(delta["Added Patterns"]) > 0 or len(delta["Removed Patterns"]) > 0 or self._gradual_patterns is None:
+            self._gradual_patterns = list(window_gps.values())
+        return delta
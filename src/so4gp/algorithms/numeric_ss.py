@@ -9,7 +9,7 @@ import random
 import numpy as np
 from dataclasses import dataclass
 from ..data_gp import DataGP
-from ..gradual_patterns import GI, GP, PairwiseMatrix
+from ..gradual_patterns import GI, GP, PairwiseMatrix, ValidBins
 
 
 class NumericSS:
@@ -127,6 +127,12 @@ class NumericSS:
         gi_key_list = list(valid_bins_dict.keys())
         pattern = NumericSS.decode_gp(position, valid_bins_dict)
 
+        engine = valid_bins_dict.support_engine if isinstance(valid_bins_dict, ValidBins) else None
+        if engine is not None:
+            # Matrix-free: count the concordant pairs of the decoded pattern directly
+            bin_sum = engine.count([gi for gi in pattern.gradual_items if gi.to_string() in valid_bins_dict])
+            return (1 / bin_sum) if bin_sum > 0 else cost
+
         pw_mat: PairwiseMatrix|None = None
         for gi in pattern.gradual_items:
             arg = np.argwhere(np.isin(np.array(gi_key_list), gi.to_string()))
@@ -134,10 +140,10 @@ class NumericSS:
                 i = arg[0][0]
                 bin_dict = valid_bins_dict[gi_key_list[i]]
                 if pw_mat is None:
-                    pw_mat = PairwiseMatrix(bin_mat=bin_dict.bin_mat, support=bin_dict.support)
+                    pw_mat = bin_dict
                 else:
                     pw_mat = GP.perform_and(pw_mat, bin_dict, -1)
-        bin_sum = int(np.sum(pw_mat.bin_mat)) if pw_mat is not None else 0
+        bin_sum = pw_mat.count() if pw_mat is not None else 0
         if bin_sum > 0:
             cost = (1 / bin_sum)
         return cost
@@ -7,14 +7,19 @@
 
 import json
 import time
+import weakref
+import itertools
 import numpy as np
-import skfuzzy as fuzzy
 import multiprocessing as mp
+from multiprocessing import shared_memory
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import MinMaxScaler
 from .graank import GRAANK
 from ..data_gp import DataGP
-from ..gradual_patterns import GI, TGP, TimeDelay
+from ..gradual_patterns import GI, GP, TGP, TimeDelay
+
+# The miner of a worker process and its shared memory blocks (see TGrad._init_step_worker)
+_step_worker: tuple | None = None
 
 
 class TGrad(GRAANK):
@@ -42,10 +47,17 @@ class TGrad(GRAANK):
         """
 
         super(TGrad, self).__init__(*args, **kwargs)
+        if self.engine != 'bitmap':
+            raise Exception("TGrad requires the 'bitmap' engine (time-lags are read from the pairwise matrices).")
         self._target_col: int = target_col
         self._min_rep: float = min_rep
         self._max_step: int = self.row_count - int(min_rep * self.row_count)
-        self._full_attr_data: np.ndarray = self.data.copy().T
+        self._full_attr_data: np.ndarray = self.attr_data
+        self._full_bitmaps: dict[int, tuple[np.ndarray, np.ndarray, np.ndarray]] | None = None
+        self._warm_counts: dict[tuple, int] | None = None
+        self._warm_step: int = 0
+        self._step_pool: tuple[int, mp.pool.Pool] | None = None
+        self._pool_finalizer: weakref.finalize | None = None
         if len(self.time_cols) > 0:
             print("Dataset Ok")
             self._time_ok: bool = True
@@ -75,31 +87,72 @@ class TGrad(GRAANK):
         if 0 < value <= 1:
             self._min_rep = value
 
-    def discover_tgp(self, parallel: bool = False, num_cores: int = 1):
+    def append_rows(self, rows) -> dict:
+        """
+        Appends new objects (rows) to the dataset (see DataGP.append_rows). The full-data arrays and bitmaps, the
+        maximum step, and the worker pool (whose shared memory holds the old data) are reset, so the next discover_tgp
+        mines the whole dataset. The extracted TGPs are kept as they were mined.
+
+        :param rows: New objects with the columns of the dataset (a DataFrame with the same titles, or a 2-D array)
+        :type rows: pd.DataFrame | np.ndarray | list
+        :return: The number of appended rows and the emerged and vanished patterns
+        """
+        changes = super(TGrad, self).append_rows(rows)
+        self._full_attr_data = self.attr_data
+        self._max_step = self.row_count - int(self._min_rep * self.row_count)
+        self._full_bitmaps = None
+        self.close_pool()
+        return changes
+
+    def discover_tgp(self, parallel: bool = False, num_cores: int = 1, top_steps: int | None = None,
+                     min_step_score: float | None = None, warm_start: bool = False):
         """
         Applies fuzzy-logic, data transformation, and gradual pattern mining to mine for Fuzzy Temporal Gradual Patterns.
 
-        :param parallel: Allow multiprocessing.
+        If top_steps or min_step_score is given, the steps are pre-screened (see screen_steps) and only the best-scoring
+        ones are mined; the scores and the pruned steps are added to the output.
+
+        :param parallel: Allow multiprocessing (the worker pool persists across calls, see close_pool).
         :param num_cores: Number of CPU cores for the algorithm to use.
+        :param top_steps: [optional] only mine the steps with the top-k screening scores.
+        :param min_step_score: [optional] only mine the steps whose screening score is at least this value.
+        :param warm_start: [optional] carry the pair counts of the apriori candidates from one step to the next, so
+        that the candidates that cannot reach the minimum support are rejected without an AND (see get_warm_bounds).
         :return: List of FTGPs as JSON object
         """
 
         start = time.time()
         self.clear_gradual_patterns()
-        # 1. Mine FTGPs
+        # 1. Select the steps (1 to max_step) to be mined
+        steps = list(range(1, self._max_step + 1))
+        step_scores = None
+        if (top_steps is not None) or (min_step_score is not None):
+            if (top_steps is not None) and (top_steps < 1):
+                raise ValueError("top_steps should be at least 1.")
+            step_scores = self.screen_steps()
+            is_kept = np.ones(step_scores.size, dtype=bool)
+            if min_step_score is not None:
+                is_kept &= step_scores >= min_step_score
+            if top_steps is not None:
+                is_top = np.zeros(step_scores.size, dtype=bool)
+                is_top[np.argsort(-step_scores, kind='stable')[:top_steps]] = True
+                is_kept &= is_top
+            steps = [int(step) for step in np.flatnonzero(is_kept) + 1]
+
+        # 2. Mine FTGPs
         if parallel:
-            # implement parallel multi-processing
-            with mp.Pool(num_cores) as pool:
-                steps = range(self._max_step)
-                pattern_data = pool.map(self._safe_transform_and_mine, steps)
+            # implement parallel multi-processing: the workers mine chunks of steps and their TGPs are streamed back
+            # (in step order) as soon as each chunk is done
+            pool = self._get_step_pool(num_cores)
+            chunk_size = max(1, -(-len(steps) // (4 * num_cores)))
+            step_chunks = [(steps[i: i + chunk_size], warm_start) for i in range(0, len(steps), chunk_size)]
+            pattern_data = itertools.chain.from_iterable(pool.imap(TGrad._mine_steps, step_chunks))
         else:
-            pattern_data: list = []
-            for step in range(self._max_step):
-                t_gps = self._safe_transform_and_mine(
-                    step + 1)  # because for-loop it is not inclusive from range: 0 - max_step
-                pattern_data.append(t_gps)
+            self._warm_counts = {} if warm_start else None
+            self._warm_step = 0
+            pattern_data = (self._safe_transform_and_mine(step) for step in steps)
 
-        # 2. Organize FTGPs into a single list
+        # 3. Organize FTGPs into a single list
         for item in pattern_data:
             if item is None:
                 continue
@@ -110,6 +163,7 @@ class TGrad(GRAANK):
             for pat in lst_pattern:
                 if isinstance(pat, TGP):
                     self.add_gradual_pattern(pat)
+        self._warm_counts = None
 
         duration = time.time() - start
         out_dict: dict[str, str | list] = {
@@ -121,9 +175,69 @@ class TGrad(GRAANK):
         self.generate_output_files(out_dict, target_col=self.target_col)
 
         out_dict.update({"Patterns": self.display_patterns})
+        if step_scores is not None:
+            out_dict.update({
+                "Step Scores": {step + 1: round(float(score), 3) for step, score in enumerate(step_scores)},
+                "Pruned Steps": sorted(set(range(1, self._max_step + 1)).difference(steps))})
         out: object = json.dumps(out_dict, indent=4)
         return out
 
+    def screen_steps(self) -> np.ndarray:
+        """
+        Scores every transformation step (1 to max_step) with the strongest rank cross-correlation (in absolute value)
+        between the target column and another attribute column shifted by the step. The columns are ranked once; the
+        cross-products of all the steps are computed at once through FFT, and the sums and sums of squares of the
+        overlapping rows are read from prefix sums.
+
+        :return: The score of every step (index 0 holds step 1)
+        """
+        n = self.row_count
+        steps = np.arange(1, self._max_step + 1)
+        size = n - steps
+        fft_size = 1 << int(2 * n - 1).bit_length()
+
+        # (centered ranks, to limit the cancellation errors in the variances)
+        tgt_ranks = TGrad.get_ranks(self._full_attr_data[self._target_col])
+        tgt_ranks -= tgt_ranks.mean()
+        tgt_fft = np.conj(np.fft.rfft(tgt_ranks, fft_size))
+        tgt_sum = np.concatenate(([0.0], np.cumsum(tgt_ranks)))[size]
+        tgt_sum_sq = np.concatenate(([0.0], np.cumsum(tgt_ranks ** 2)))[size]
+        tgt_var = tgt_sum_sq - tgt_sum ** 2 / size
+
+        step_scores = np.zeros(steps.size)
+        for col in self.attr_cols:
+            if col == self._target_col:
+                continue
+            col_ranks = TGrad.get_ranks(self._full_attr_data[col])
+            col_ranks -= col_ranks.mean()
+            # sum(tgt[i] * col[i + step]) for i in 0..n-step-1
+            cross_sum = np.fft.irfft(tgt_fft * np.fft.rfft(col_ranks, fft_size), fft_size)[steps]
+            col_prefix = np.concatenate(([0.0], np.cumsum(col_ranks)))
+            col_prefix_sq = np.concatenate(([0.0], np.cumsum(col_ranks ** 2)))
+            col_sum = col_prefix[n] - col_prefix[steps]
+            col_sum_sq = col_prefix_sq[n] - col_prefix_sq[steps]
+            col_var = col_sum_sq - col_sum ** 2 / size
+
+            # (windows where either column is constant are not correlated)
+            is_valid = (tgt_var > 1e-9 * tgt_sum_sq) & (col_var > 1e-9 * col_sum_sq)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                corr = (cross_sum - tgt_sum * col_sum / size) / np.sqrt(tgt_var * col_var)
+            corr = np.where(is_valid, np.clip(np.abs(corr), 0, 1), 0.0)
+            step_scores = np.maximum(step_scores, corr)
+        return step_scores
+
+    @staticmethod
+    def get_ranks(col_data: np.ndarray) -> np.ndarray:
+        """
+        Ranks the values of a column (tied values receive their average rank).
+
+        :param col_data: Numeric values of the attribute.
+        :return: The ranks (starting from 1)
+        """
+        _, inverse, counts = np.unique(col_data, return_inverse=True, return_counts=True)
+        avg_ranks = np.cumsum(counts) - (counts - 1) / 2
+        return avg_ranks[inverse]
+
     def transform_and_mine(self, step: int, return_patterns: bool = True):
         """
         A method that: (1) transforms data according to a step value and, (2) mines the transformed data for FTGPs.
@@ -150,27 +264,28 @@ class TGrad(GRAANK):
                           "0 and " + str(self.col_count - 1)
                     raise Exception(msg)
                 else:
-                    # 2. Transform datasets
+                    # 2. Transform datasets (not needed for mining, unless the bitmaps are bit-packed, since the
+                    # bitmaps of the step are sub-blocks of the full-data bitmaps)
                     delayed_attr_data = None
                     n = self.row_count
-                    for col_index in range(self.col_count):
-                        # Transform the datasets using (row) n+step
-                        if (col_index == tgt_col) or (col_index in self.time_cols):
-                            # date-time column OR target column
-                            temp_row = self._full_attr_data[col_index][0: (n - step)]
-                        else:
-                            # other attributes
-                            temp_row = self._full_attr_data[col_index][step: n]
-
-                        delayed_attr_data = temp_row if (delayed_attr_data is None) \
-                            else np.vstack((delayed_attr_data, temp_row))
+                    if (not return_patterns) or self.packed:
+                        delayed_attr_data = np.empty((self.col_count, n - step), dtype=self._full_attr_data.dtype)
+                        for col_index in range(self.col_count):
+                            # Transform the datasets using (row) n+step
+                            if (col_index == tgt_col) or (col_index in self.time_cols):
+                                # date-time column OR target column
+                                delayed_attr_data[col_index] = self._full_attr_data[col_index][0: (n - step)]
+                            else:
+                                # other attributes
+                                delayed_attr_data[col_index] = self._full_attr_data[col_index][step: n]
                     # print(f"Time Diffs: {time_diffs}\n")
                     # print(f"{self.full_attr_data}: {type(self.full_attr_data)}\n")
                     # print(f"{delayed_attr_data}: {type(delayed_attr_data)}\n")
 
                     if return_patterns:
                         # 2. Execute t-graank for each transformation
-                        t_gps = self._mine_gps_at_step(time_delay_data=time_diffs, attr_data=delayed_attr_data)
+                        t_gps = self._mine_gps_at_step(time_delay_data=time_diffs, attr_data=delayed_attr_data,
+                                                       step=step)
                         if len(t_gps) > 0:
                             return t_gps
                         return False
@@ -188,43 +303,162 @@ class TGrad(GRAANK):
             print(f"Error at step {step}: {e}")
             return None
 
-    def _mine_gps_at_step(self, time_delay_data: np.ndarray | dict, attr_data: np.ndarray = None,
-                          clustering_method: bool = False) -> list[TGP] | tuple[list[TGP], dict]:
+    def close_pool(self) -> None:
+        """
+        Shuts down the worker pool of discover_tgp(parallel=True) and releases its shared memory blocks.
+
+        :return: void
+        """
+        if self._pool_finalizer is not None:
+            self._pool_finalizer()
+        self._pool_finalizer = None
+        self._step_pool = None
+
+    def _get_step_pool(self, num_cores: int) -> mp.pool.Pool:
+        """
+        Returns the worker pool for mining the steps in parallel. When the pool is started, the attribute and time
+        arrays are copied into shared memory blocks once; every worker process attaches to them and keeps a light copy
+        of this miner (without the raw data), so a task only carries a chunk of steps. The pool is reused by later
+        calls with the same number of cores.
+
+        :param num_cores: Number of worker processes.
+        :return: The worker pool
+        """
+        if self._step_pool is not None and self._step_pool[0] == num_cores:
+            return self._step_pool[1]
+        self.close_pool()
+
+        shm_blocks = []
+        shm_specs = {}
+        try:
+            for name in ('_attr_data', '_time_data'):
+                arr = np.ascontiguousarray(getattr(self, name))
+                shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+                shm_blocks.append(shm)
+                np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+                shm_specs[name] = (shm.name, arr.shape, arr.dtype.str)
+
+            state = self.__dict__.copy()
+            for name in ('_data', '_data_src', '_time_values', '_attr_data', '_time_data', '_full_attr_data',
+                         '_full_bitmaps', '_valid_bins', '_warping_set', '_gradual_patterns', '_warm_counts',
+                         '_step_pool', '_pool_finalizer'):
+                state[name] = None
+            pool = mp.Pool(num_cores, initializer=TGrad._init_step_worker, initargs=(type(self), state, shm_specs))
+        except BaseException:
+            TGrad._release_pool(None, shm_blocks)
+            raise
+        self._pool_finalizer = weakref.finalize(self, TGrad._release_pool, pool, shm_blocks)
+        self._step_pool = (num_cores, pool)
+        return pool
+
+    @staticmethod
+    def _release_pool(pool: mp.pool.Pool | None, shm_blocks: list[shared_memory.SharedMemory]) -> None:
+        """Terminates a worker pool and unlinks its shared memory blocks."""
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        for shm in shm_blocks:
+            shm.close()
+            shm.unlink()
+
+    @staticmethod
+    def _init_step_worker(miner_cls: type, state: dict, shm_specs: dict) -> None:
+        """
+        Initializes a worker process: rebuilds the miner from its state and attaches its data arrays to the shared
+        memory blocks.
+
+        :param miner_cls: Class of the miner (TGrad or a subclass)
+        :param state: Attributes of the miner (without the data arrays)
+        :param shm_specs: Name, shape, and dtype of the shared memory block of each data array
+        :return: void
+        """
+        global _step_worker
+        miner = miner_cls.__new__(miner_cls)
+        miner.__dict__.update(state)
+        shm_blocks = []
+        for name, (shm_name, shape, dtype) in shm_specs.items():
+            shm = shared_memory.SharedMemory(name=shm_name)
+            shm_blocks.append(shm)
+            setattr(miner, name, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf))
+        miner._full_attr_data = miner.attr_data
+        miner.clear_gradual_patterns()
+        _step_worker = (miner, shm_blocks)
+
+    @staticmethod
+    def _get_worker_miner() -> 'TGrad':
+        """Returns the miner of the current worker process (see _init_step_worker)."""
+        return _step_worker[0]
+
+    @staticmethod
+    def _mine_steps(task: tuple[list[int], bool]) -> list:
+        """
+        Mines a chunk of steps in a worker process (see _init_step_worker).
+
+        :param task: Data transformation steps and the warm-start option.
+        :return: The mining result of every step
+        """
+        miner = TGrad._get_worker_miner()
+        steps, warm_start = task
+        if not warm_start:
+            miner._warm_counts = None
+        elif miner._warm_counts is None:
+            miner._warm_counts = {}
+            miner._warm_step = 0
+        return [miner._safe_transform_and_mine(step) for step in steps]
+
+    def _mine_gps_at_step(self, time_delay_data: np.ndarray, attr_data: np.ndarray | list[np.ndarray] = None,
+                          clustering_method: bool | str = False, step: int | None = None) -> list[TGP] | tuple[list[TGP], dict]:
         """
         Uses apriori algorithm to find GP candidates based on the target-attribute. The candidates are validated if
         their computed support is greater than or equal to the minimum support threshold specified by the user.
 
         :param time_delay_data: Time-delay values
-        :param attr_data: the transformed data.
-        :param clustering_method: Find and approximate the best time-delay value using KMeans and Hill-climbing approach.
+        :param attr_data: the transformed data (an array or a list of column views).
+        :param clustering_method: Find and approximate the best time-delay value using a clustering algorithm and
+        Hill-climbing approach: 'kmeans' (KMeans, also used if True) or 'dp' (exact 1-D clustering).
+        :param step: Data transformation step; if attr_data is None, the bitmaps of the step are served as sub-blocks of
+        the full-data bitmaps.
         :return: Temporal-GPs as a list.
         """
 
         try:
             # If min-rep is too low
-            self.fit_bitmap(attr_data)
+            if (attr_data is None) and (step is not None):
+                self._fit_step_bitmaps(step)
+            else:
+                self.fit_bitmap(attr_data)
         except ZeroDivisionError:
             return []
 
         t_gps: list[TGP] = []
         valid_bins_dict: dict = (self.valid_bins or {}).copy()
-
-        if clustering_method and isinstance(time_delay_data, np.ndarray):
+        # In the warm-start mode, the candidates are checked against the pair counts of the previous steps
+        warm_bounds = self.get_warm_bounds(step) if (self._warm_counts is not None) and (step is not None) else None
+        max_supports, step_supports = None, None
+        if warm_bounds is not None:
+            n_pairs = self.attr_size * (self.attr_size - 1) / 2
+            max_supports = {gp_key: bound / n_pairs for gp_key, bound in warm_bounds.items()}
+            step_supports = {}
+
+        if clustering_method and (time_delay_data is not None):
             # Build the main triangular MF using the clustering algorithm
-            a, b, c = TGrad.build_mf_w_clusters(time_delay_data)
+            method = 'kmeans' if clustering_method is True else clustering_method
+            a, b, c = TGrad.build_mf_w_clusters(time_delay_data, method=method)
             tri_mf_data = np.array([a, b, c])
         else:
             tri_mf_data = None
 
         invalid_count = 0
         while len(valid_bins_dict) > 0:
-            valid_bins_dict, inv_count = self._gen_apriori_candidates(valid_bins_dict, target_col=self._target_col)
+            valid_bins_dict, inv_count = self._gen_apriori_candidates(valid_bins_dict, target_col=self._target_col,
+                                                                      max_supports=max_supports,
+                                                                      supports=step_supports)
             invalid_count += inv_count
             for gp_set, gi_data in valid_bins_dict.items():
                 if type(self) is TGrad:
-                    t_lag = self.get_fuzzy_time_lag(gi_data.bin_mat, time_delay_data, gi_arr=None, tri_mf_data=tri_mf_data)
+                    t_lag = self.get_fuzzy_time_lag(gi_data.to_dense(), time_delay_data, gi_arr=None, tri_mf_data=tri_mf_data)
                 else:
-                    t_lag = self.get_fuzzy_time_lag(gi_data.bin_mat, time_delay_data, gi_arr=gp_set, tri_mf_data=tri_mf_data)
+                    t_lag = self.get_fuzzy_time_lag(gi_data.to_dense(), time_delay_data, gi_arr=gp_set, tri_mf_data=tri_mf_data)
 
                 if t_lag.valid:
                     tgp: TGP = TGP()
@@ -236,44 +470,159 @@ class TGrad(GRAANK):
                             tgp.add_temporal_gradual_item(gi, t_lag)
                     tgp.support = gi_data.support
                     warping_set_arr: np.ndarray = np.array(
-                        DataGP.gen_gradual_warping_set(gi_data.bin_mat, as_array=True))
+                        DataGP.gen_gradual_warping_set(gi_data.to_dense(), as_array=True))
                     tgp.compute_descriptors(warping_set_arr, obj_count=self.row_count)
                     t_gps.append(tgp)
+
+        if warm_bounds is not None:
+            # Keep the exact pair counts of the evaluated candidates (and the bounds of the others) for the next steps
+            n_pairs = self.attr_size * (self.attr_size - 1) / 2
+            warm_bounds.update({gp_key: int(round(supp * n_pairs)) for gp_key, supp in step_supports.items()})
+            self._warm_counts = {gp_key: bound for gp_key, bound in warm_bounds.items() if bound < n_pairs}
+            self._warm_step = step
         return t_gps
 
+    def get_warm_bounds(self, step: int) -> dict[tuple, int]:
+        """
+        Computes upper bounds of the pair counts, at a transformation step, of the candidates evaluated at the previous
+        (mined) step. If the previous step is s and the new one is s+k, a pair (i, j) of a candidate at step s+k holds
+        the target pair (i, j) and the attribute pairs (i+s+k, j+s+k); at step s, the pair (i+k, j+k) of the candidate
+        holds the same attribute pairs. So the pair count can only grow by the number of target pairs (i, j) that do not
+        hold at (i+k, j+k) (see count_shift_losses), which is shared by all the candidates.
+
+        :param step: Data transformation step (after the previous one).
+        :return: The bound of the pair count of every carried candidate
+        """
+        prev_step = self._warm_step
+        if (len(self._warm_counts) == 0) or (prev_step >= step):
+            return {}
+        size = self.row_count - step
+        loss = TGrad.count_shift_losses(self._full_attr_data[self._target_col], step - prev_step, size,
+                                        eq=self._include_equal_values)
+        return {gp_key: pair_count + loss for gp_key, pair_count in self._warm_counts.items()}
+
+    @staticmethod
+    def count_shift_losses(col_data: np.ndarray, shift: int, size: int, eq: bool = False) -> int:
+        """
+        Counts the object pairs (i, j) among the first 'size' objects that respect the gradual item 'col+', while the
+        pair (i+shift, j+shift) does not. The objects are compared block by block, so no size×size temporary is created.
+        The count is the same for the gradual item 'col-'.
+
+        :param col_data: Numeric values of the attribute
+        :param shift: Number of objects between the two pairs
+        :param size: Number of objects compared
+        :param eq: Encode equal values as gradual
+        :return: Number of lost object pairs
+        """
+        compare = np.greater_equal if eq else np.greater
+        values = DataGP.as_float(col_data)
+        head, tail = values[0:size], values[shift:shift + size]
+        block_rows = int(max(1, GP.BLOCK_BYTES // max(2 * size, 1)))
+
+        loss_count = 0
+        with np.errstate(invalid='ignore'):
+            for r0 in range(0, size, block_rows):
+                r1 = min(r0 + block_rows, size)
+                # (a pair (i, i) is only counted if a value is missing, which loosens the bounds)
+                lost = compare(head, head[r0:r1, np.newaxis])
+                lost &= ~compare(tail, tail[r0:r1, np.newaxis])
+                loss_count += int(np.count_nonzero(lost))
+        return loss_count
+
+    def _fit_full_bitmaps(self) -> None:
+        """
+        Builds (once) the bitmap of every attribute column over all the rows, together with the pair counts of all its
+        leading sub-blocks [0:m, 0:m] and trailing sub-blocks [s:n, s:n] (see get_sub_block_counts).
+
+        :return: void
+        """
+        if self._full_bitmaps is not None:
+            return
+        n = self.row_count
+        tile_rows = self._get_tile_size(n)
+        col_arrays = [DataGP.as_float(self._full_attr_data[col]) for col in self.attr_cols]
+        self._full_bitmaps = {}
+        for col, (bin_mat, _) in zip(self.attr_cols, self._build_bitmaps(col_arrays)):
+            head_counts, tail_counts = TGrad.get_sub_block_counts(bin_mat, tile_rows)
+            self._full_bitmaps[int(col)] = (bin_mat, head_counts, tail_counts)
+
+    def _fit_step_bitmaps(self, step: int) -> None:
+        """
+        Serves the bitmaps of a transformation step as zero-copy views of the full-data bitmaps. A column shifted by the
+        step (rows step:n) uses the sub-block [step:n, step:n]; the target column (rows 0:n-step) uses the sub-block
+        [0:n-step, 0:n-step]. Their supports are read from the precomputed sub-block counts.
+
+        :param step: Data transformation step.
+        :return: void
+        """
+        self._fit_full_bitmaps()
+        n = self.row_count
+        size = n - step
+        bitmaps = {}
+        for col, (bin_mat, head_counts, tail_counts) in self._full_bitmaps.items():
+            if col == self._target_col:
+                bitmaps[col] = (bin_mat[0:size, 0:size], int(head_counts[size]))
+            else:
+                bitmaps[col] = (bin_mat[step:n, step:n], int(tail_counts[step]))
+        self.fit_bitmap_views(bitmaps, size)
+
+    @staticmethod
+    def get_sub_block_counts(bin_mat: np.ndarray, tile_rows: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Computes the pair counts of every leading sub-block B[0:m, 0:m] and every trailing sub-block B[s:n, s:n] of an
+        n×n bitmap B in one pass. Removing object k from a sub-block removes its row and its column, so the counts are
+        adjusted incrementally: e.g., count[s:n, s:n] = count[s-1:n, s-1:n] - sum(B[s-1, s-1:]) - sum(B[s:, s-1]).
+
+        :param bin_mat: A dense n×n bitmap
+        :param tile_rows: Number of rows read per tile (all rows if None)
+        :return: The leading counts (indexed by m) and the trailing counts (indexed by s), each of size n+1
+        """
+        n = bin_mat.shape[0]
+        tile_rows = n if tile_rows is None else max(1, min(tile_rows, n))
+        row_upper = np.zeros(n, dtype=np.int64)  # sum(B[k, k:])
+        row_total = np.zeros(n, dtype=np.int64)  # sum(B[k, :])
+        col_lower = np.zeros(n, dtype=np.int64)  # sum(B[k+1:, k])
+        col_total = np.zeros(n, dtype=np.int64)  # sum(B[:, k])
+        for r0 in range(0, n, tile_rows):
+            r1 = min(r0 + tile_rows, n)
+            tile = np.asarray(bin_mat[r0:r1], dtype=bool)
+            upper = np.triu(tile, k=r0)
+            row_upper[r0:r1] = np.count_nonzero(upper, axis=1)
+            row_total[r0:r1] = np.count_nonzero(tile, axis=1)
+            col_lower += np.count_nonzero(tile, axis=0) - np.count_nonzero(upper, axis=0)
+            col_total += np.count_nonzero(tile, axis=0)
+        diag = np.asarray(np.diagonal(bin_mat), dtype=np.int64)
+        total = int(row_total.sum())
+
+        # Removing object k from the front (trailing sub-blocks) or from the back (leading sub-blocks)
+        front_loss = row_upper + col_lower
+        back_loss = (row_total - row_upper + diag) + (col_total - col_lower - diag)
+        tail_counts = total - np.concatenate(([0], np.cumsum(front_loss)))
+        head_counts = total - np.concatenate((np.cumsum(back_loss[::-1])[::-1], [0]))
+        return head_counts, tail_counts
+
     def get_time_diffs(self, step: int):  # optimized
         """
-        A method that computes the difference between 2 timestamps separated by a specific transformation step.
+        A method that computes the difference between 2 timestamps separated by a specific transformation step. It
+        reads the epochs parsed (once) at load time (see DataGP.time_data).
 
         :param step: Data transformation step.
-        :return: Dict of time delay values
+        :return: Array of time delay values (one per transformed row)
         """
         size = self.row_count
-        time_diffs = {}  # {row: time-lag}
-        for i in range(size):
-            if i < (size - step):
-                stamp_1 = 0
-                stamp_2 = 0
-                for col in self.time_cols:  # sum timestamps from all time-columns
-                    temp_1 = str(self.data[i][int(col)])
-                    temp_2 = str(self.data[i + step][int(col)])
-                    temp_stamp_1 = TGrad.get_timestamp(temp_1)
-                    temp_stamp_2 = TGrad.get_timestamp(temp_2)
-                    if (not temp_stamp_1) or (not temp_stamp_2):
-                        # Unable to read time
-                        return False, [i + 1, i + step + 1]
-                    else:
-                        stamp_1 += temp_stamp_1
-                        stamp_2 += temp_stamp_2
-                time_diff = (stamp_2 - stamp_1)
-                # if time_diff < 0:
-                # Error time CANNOT go backwards,
-                # print(f"Problem {i} and {i + step} - {self.time_cols}")
-                #    return False, [i + 1, i + step + 1]
-                time_diffs[int(i)] = float(abs(time_diff))
+        time_data = self.time_data
+        invalid = np.any(time_data == DataGP.INVALID_TIME, axis=0)
+        invalid_rows = np.flatnonzero(invalid[:size - step] | invalid[step:])
+        if invalid_rows.size > 0:
+            # Unable to read time
+            i = int(invalid_rows[0])
+            return False, [i + 1, i + step + 1]
+        # Sum the timestamps from all time-columns
+        stamps = time_data.sum(axis=0, dtype=np.float64)
+        time_diffs = np.abs(stamps[step:] - stamps[:size - step])
         return True, time_diffs
 
-    def get_fuzzy_time_lag(self, bin_data: np.ndarray, time_data: np.ndarray | dict, gi_arr: set = None,
+    def get_fuzzy_time_lag(self, bin_data: np.ndarray, time_data: np.ndarray | None, gi_arr: set = None,
                            tri_mf_data: np.ndarray | None = None) -> TimeDelay:
         """
         A method that uses a fuzzy membership function to select the most accurate time-delay value. We implement two
@@ -281,7 +630,7 @@ class TGrad(GRAANK):
         (2) uses metaheuristic hill-climbing to find the best time-delay value.
 
         :param bin_data: Gradual item pairwise matrix.
-        :param time_data: Time-delay values.
+        :param time_data: Time-delay values (one row per attribute column if gi_arr is given).
         :param gi_arr: Gradual item object.
         :param tri_mf_data: The 'a,b,c' values of the triangular MF. Used to find and approximate the best time-delay value
         using KMeans and Hill-climbing approach.
@@ -292,9 +641,6 @@ class TGrad(GRAANK):
         if time_data is None:
             return TimeDelay()
 
-        time_data_as_arr: np.ndarray | None = time_data if isinstance(time_data, np.ndarray) else None
-        time_data_as_dict: dict | None = time_data if isinstance(time_data, dict) else None
-
         def approx_time_slide_calculate(time_lag_arr: np.ndarray) -> TimeDelay:
             """
 
@@ -314,29 +660,25 @@ class TGrad(GRAANK):
                 count = time_lag_arr.size + 3
                 tot_boundaries = np.linspace(min_a / 2, max_c + 1, num=count)
 
-                highest_sup = 0
-                center = time_lag_arr[0]
+                # All the windows (a, b, c) at once: every other boundary, the last window is aligned to the end
                 size = len(tot_boundaries)
-                for i in range(0, size, 2):
-                    if (i + 3) <= size:
-                        boundaries = tot_boundaries[i:i + 3:1]
-                    else:
-                        boundaries = tot_boundaries[size - 3:size:1]
-                    memberships = fuzzy.membership.trimf(time_lag_arr, boundaries)
-
-                    # Compute Support
-                    sup_count = np.count_nonzero(memberships > 0)
-                    total = memberships.size
-                    curr_sup = sup_count / total
-                    # curr_sup = calculate_support(memberships)
-
-                    if curr_sup > highest_sup:
-                        highest_sup = curr_sup
-                        center = boundaries[1]
-                    if curr_sup >= 0.5:
-                        # print(boundaries[1])
-                        return TimeDelay(int(boundaries[1]), curr_sup)
-                return TimeDelay(center, highest_sup)
+                starts = np.minimum(np.arange(0, size, 2), size - 3)
+                a, b, c = tot_boundaries[starts], tot_boundaries[starts + 1], tot_boundaries[starts + 2]
+
+                # Compute Support: the triangular MF is non-zero for the time-lags in (a, c)
+                sorted_lags = np.sort(time_lag_arr)
+                sup_counts = np.searchsorted(sorted_lags, c, side='left') - np.searchsorted(sorted_lags, a, side='right')
+                supports = sup_counts / time_lag_arr.size
+
+                # The first window with a support of at least 0.5, otherwise the (first) one with the highest support
+                passed = np.flatnonzero(supports >= 0.5)
+                if passed.size > 0:
+                    i = passed[0]
+                    return TimeDelay(int(b[i]), supports[i])
+                i = int(np.argmax(supports))
+                if supports[i] > 0:
+                    return TimeDelay(b[i], supports[i])
+                return TimeDelay(time_lag_arr[0], 0)
 
         def approx_time_hill_climbing(x_train: np.ndarray, initial_bias: float = 0, step_size: float = 0.9,
                                       max_iterations: int = 10):
@@ -412,14 +754,9 @@ class TGrad(GRAANK):
                 elif (col != self._target_col) and (col > self._target_col):
                     selected_cols.append(col - (len(self.time_cols) + 1))
             selected_cols = np.array(selected_cols, dtype=int)
-            t_lag_arr = time_data_as_arr[
-                np.ix_(selected_cols, selected_rows)] if time_data_as_arr is not None else np.array([])
+            t_lag_arr = time_data[np.ix_(selected_cols, selected_rows)]
         else:
-            time_lags = []
-            for row, stamp_diff in (time_data_as_dict or {}).items():  # {row: time-lag-stamp}
-                if int(row) in selected_rows:
-                    time_lags.append(stamp_diff)
-            t_lag_arr = np.array(time_lags)
+            t_lag_arr = time_data[selected_rows]
             best_time_lag = approx_time_slide_calculate(t_lag_arr)
             return best_time_lag
 
@@ -465,55 +802,86 @@ class TGrad(GRAANK):
             return False
 
     @staticmethod
-    def build_mf_w_clusters(time_data: np.ndarray | None):
+    def build_mf_w_clusters(time_data: np.ndarray | None, method: str = 'kmeans', max_clusters: int = 16):
         """
         A method that builds the boundaries of a fuzzy Triangular membership function (MF) using Singular Value
         Decomposition (to estimate the number of centers) and KMeans algorithm to group time data according to the
         identified centers. We then use the largest cluster to build the MF.
 
+        With method 'dp', the time data is sorted and optimally partitioned by an exact 1-D clustering (see
+        get_1d_clusters) into a bounded number of clusters; the singular value is read as the norm of the scaled data.
+
         :param time_data: Time-delay values as an array.
+        :param method: Clustering algorithm: 'kmeans' (default) or 'dp' (exact 1-D k-means).
+        :param max_clusters: Maximum number of clusters (only for 'dp').
         :return: The boundary values of the triangular membership function.
         """
 
         if time_data is None:
             return 0, 0, 0
+        if method not in ('kmeans', 'dp'):
+            raise ValueError("Invalid clustering method. It should be either 'kmeans' or 'dp'.")
 
         try:
-            # 1. Reshape into 1-column dataset
-            time_data = time_data.reshape(-1, 1)
-
-            # 2. Standardize data
-            scaler = MinMaxScaler()
-            data_scaled = scaler.fit_transform(time_data)
-
-            # 3. Apply SVD
-            u, s, vt = np.linalg.svd(data_scaled, full_matrices=False)
-
-            # 4. Plot singular values to help determine the number of clusters
-            # Based on the plot, choose the number of clusters (e.g., 3 clusters)
-            num_clusters = int(s[0])
-
-            # 5. Perform k-means clustering
-            kmeans = KMeans(n_clusters=num_clusters)
-            kmeans.fit(data_scaled)
-
-            # 6. Get cluster centers
-            centers = kmeans.cluster_centers_.flatten()
-
-            # 7. Define membership functions to ensure membership > 0.5
-            largest_mf = [0, 0, 0]
-            for center in centers:
-                half_width = 0.5 / 2  # since the membership value should be > 0.5
+            if method == 'dp':
+                # 1. Sort the time data and scale it to [0, 1]
+                sorted_data = np.sort(np.ravel(time_data).astype(float))
+                min_val = sorted_data[0]
+                data_range = sorted_data[-1] - min_val
+
+                # 2. The largest singular value of a 1-column dataset is the norm of the column
+                if data_range > 0:
+                    num_clusters = int(np.linalg.norm((sorted_data - min_val) / data_range))
+                else:
+                    num_clusters = 1
+                distinct_count = int(np.count_nonzero(np.diff(sorted_data))) + 1
+                num_clusters = max(1, min(num_clusters, max_clusters, distinct_count))
+
+                # 3. Cluster and build the MF around the center of the largest cluster
+                starts = TGrad.get_1d_clusters(sorted_data, num_clusters)
+                sizes = np.diff(np.append(starts, sorted_data.size))
+                i = int(np.argmax(sizes))
+                center = sorted_data[starts[i]: starts[i] + sizes[i]].mean()
+                half_width = (0.5 / 2) * data_range  # since the membership value should be > 0.5
                 a = center - half_width
                 b = center
                 c = center + half_width
-                if abs(c - a) > abs(largest_mf[2] - largest_mf[0]):
-                    largest_mf = [a, b, c]
-
-            # 8. Reverse the scaling
-            a = scaler.inverse_transform([[largest_mf[0]]])[0, 0]
-            b = scaler.inverse_transform([[largest_mf[1]]])[0, 0]
-            c = scaler.inverse_transform([[largest_mf[2]]])[0, 0]
+            else:
+                # 1. Reshape into 1-column dataset
+                time_data = time_data.reshape(-1, 1)
+
+                # 2. Standardize data
+                scaler = MinMaxScaler()
+                data_scaled = scaler.fit_transform(time_data)
+
+                # 3. Apply SVD
+                u, s, vt = np.linalg.svd(data_scaled, full_matrices=False)
+
+                # 4. Plot singular values to help determine the number of clusters
+                # Based on the plot, choose the number of clusters (e.g., 3 clusters)
+                num_clusters = int(s[0])
+
+                # 5. Perform k-means clustering
+                kmeans = KMeans(n_clusters=num_clusters)
+                kmeans.fit(data_scaled)
+
+                # 6. Get cluster centers
+                centers = kmeans.cluster_centers_.flatten()
+
+                # 7. Define membership functions to ensure membership > 0.5
+                largest_mf = [0, 0, 0]
+                for center in centers:
+                    half_width = 0.5 / 2  # since the membership value should be > 0.5
+                    a = center - half_width
+                    b = center
+                    c = center + half_width
+                    if abs(c - a) > abs(largest_mf[2] - largest_mf[0]):
+                        largest_mf = [a, b, c]
+
+                # 8. Reverse the scaling
+                a = scaler.inverse_transform([[largest_mf[0]]])[0, 0]
+                b = scaler.inverse_transform([[largest_mf[1]]])[0, 0]
+                c = scaler.inverse_transform([[largest_mf[2]]])[0, 0]
 
             # 9. Shift to remove negative MF (we do not want negative timestamps)
             if a < 0:
@@ -525,3 +893,64 @@ class TGrad(GRAANK):
         except Exception as e:
             print(e)
             return 0, 0, 0
+
+    @staticmethod
+    def get_1d_clusters(sorted_data: np.ndarray, num_clusters: int) -> np.ndarray:
+        """
+        Partitions sorted 1-D data into contiguous clusters with the least within-cluster sum of squares (exact 1-D
+        k-means) through dynamic programming. The best split points of a layer are monotone, so every layer is solved
+        by divide and conquer; all the sub-problems of a recursion level are evaluated at once with array operations.
+
+        :param sorted_data: Values sorted in ascending order.
+        :param num_clusters: Number of clusters.
+        :return: The start index of every cluster (the first one is 0).
+        """
+        m = sorted_data.size
+        num_clusters = max(1, min(num_clusters, m))
+        sum_1 = np.concatenate(([0.0], np.cumsum(sorted_data)))
+        sum_2 = np.concatenate(([0.0], np.cumsum(sorted_data ** 2)))
+
+        def get_cost(j: np.ndarray, i: np.ndarray) -> np.ndarray:
+            """Sum of squares of sorted_data[j:i] around its mean"""
+            return (sum_2[i] - sum_2[j]) - (sum_1[i] - sum_1[j]) ** 2 / (i - j)
+
+        # cost[i]: the least cost of clustering sorted_data[0:i] (into c + 1 clusters)
+        cost = np.full(m + 1, np.inf)
+        cost[1:] = get_cost(np.zeros(m, dtype=int), np.arange(1, m + 1))
+        splits = np.zeros((num_clusters, m + 1), dtype=int)
+        for c in range(1, num_clusters):
+            new_cost = np.full(m + 1, np.inf)
+            # Sub-problems: the ends in [lo, hi] whose best split lies in [opt_lo, opt_hi]
+            lo, hi = np.array([c + 1]), np.array([m])
+            opt_lo, opt_hi = np.array([c]), np.array([m - 1])
+            while lo.size > 0:
+                mid = (lo + hi) // 2
+                lengths = np.minimum(mid - 1, opt_hi) - opt_lo + 1
+                seg_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+                task_ids = np.repeat(np.arange(lo.size), lengths)
+                candidates = np.arange(task_ids.size) - seg_starts[task_ids] + opt_lo[task_ids]
+                values = cost[candidates] + get_cost(candidates, mid[task_ids])
+
+                # The (first) best split of every sub-problem
+                seg_min = np.minimum.reduceat(values, seg_starts)
+                hits = np.flatnonzero(values <= seg_min[task_ids])
+                _, first_hits = np.unique(task_ids[hits], return_index=True)
+                best = candidates[hits[first_hits]]
+                new_cost[mid] = seg_min
+                splits[c, mid] = best
+
+                is_left = mid > lo
+                is_right = mid < hi
+                lo, hi, opt_lo, opt_hi = (np.concatenate((lo[is_left], mid[is_right] + 1)),
+                                          np.concatenate((mid[is_left] - 1, hi[is_right])),
+                                          np.concatenate((opt_lo[is_left], best[is_right])),
+                                          np.concatenate((best[is_left], opt_hi[is_right])))
+            cost = new_cost
+
+        # Backtrack the split points
+        starts = np.zeros(num_clusters, dtype=int)
+        i = m
+        for c in range(num_clusters - 1, 0, -1):
+            i = splits[c, i]
+            starts[c] = i
+        return starts
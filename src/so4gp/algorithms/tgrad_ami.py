@@ -57,7 +57,7 @@ class TGradAMI(TGrad):
     def feature_cols(self):
         return self._feature_cols
 
-    def find_best_mutual_info(self):
+    def find_best_mutual_info(self, estimator: str = 'knn', num_cores: int = 1, bins: int | None = None):
         """
         A method that computes the mutual information I(X; Y) of the original dataset and all the transformed datasets
         w.r.t. Minimum representativity threshold.
@@ -67,24 +67,35 @@ class TGradAMI(TGrad):
         distinguish very small MI values. This is beautiful because if the initial MI is 0, then both will be -1, making it
         the optimal MI with any other -1 in the time-delayed MIs.
 
+        The steps are scanned in order (on shifted views of the data) and the scan stops as soon as the MI of every
+        feature is within the error margin. With num_cores > 1, the 'knn' estimates of consecutive steps are computed in
+        parallel by the worker pool (see TGrad.discover_tgp). The 'binned' estimator computes MI from the histograms of
+        equal-frequency bins, whose marginal counts are updated incrementally as the step increases.
+
+        :param estimator: MI estimator: 'knn' (sklearn's mutual_info_regression, default) or 'binned'.
+        :param num_cores: Number of CPU cores used by the 'knn' estimator.
+        :param bins: Number of bins of the 'binned' estimator (the default follows Sturges' rule).
         :return: {column index: transformation step}
         """
+        if estimator not in ('knn', 'binned'):
+            raise ValueError("Invalid MI estimator. It should be either 'knn' or 'binned'.")
 
         # 1. Compute MI for original dataset w.r.t. target-col
-        y = np.array(self.full_attr_data[self.target_col], dtype=float).T
-        x_data = np.array(self.full_attr_data[self._feature_cols], dtype=float).T
-        init_mi_info = np.array(mutual_info_regression(x_data, y), dtype=float)
+        steps = list(range(1, self.max_step))
+        if estimator == 'binned':
+            mi_scan = zip([0] + steps, self.get_binned_mutual_info([0] + steps, bins=bins))
+            _, init_mi_info = next(mi_scan)
+        else:
+            init_mi_info = self.get_mutual_info(0)
+            if np.any(np.isnan(init_mi_info)):
+                raise ValueError("The mutual information of the original dataset could not be estimated.")
+            mi_scan = self._scan_mutual_info(steps, num_cores)
 
         # 2. Compute all the MI for every time-delay and compute error
         mi_list = []
-        for step in range(1, self.max_step):
-            # Compute MI
-            attr_data, _ = self.transform_and_mine(step, return_patterns=False)
-            y = np.array(attr_data[self.target_col], dtype=float).T
-            x_data = np.array(attr_data[self._feature_cols], dtype=float).T
-            try:
-                mi_vals = np.array(mutual_info_regression(x_data, y), dtype=float)
-            except ValueError:
+        for step, mi_vals in mi_scan:
+            if np.any(np.isnan(mi_vals)):
+                # MI could not be estimated (e.g., too few objects)
                 optimal_dict = {int(self._feature_cols[i]): step for i in range(len(self._feature_cols))}
                 self._mi_error = -1
                 self.min_rep = round(((self.row_count - step) / self.row_count), 5)
@@ -119,59 +130,134 @@ class TGradAMI(TGrad):
         self.min_rep = round(((self.row_count - max_step) / self.row_count), 5)
         return optimal_dict, max_step
 
-    def gather_delayed_data(self, optimal_dict: dict, max_step: int):
+    def get_mutual_info(self, step: int) -> np.ndarray:
+        """
+        Computes (with sklearn's k-NN estimator) the MI between the target column and every feature column shifted by a
+        step.
+
+        :param step: Data transformation step.
+        :return: The MI of every feature (NaN if it could not be estimated)
+        """
+        n = self.row_count
+        y = self.full_attr_data[self.target_col][0: n - step]
+        x_data = self.full_attr_data[self._feature_cols, step: n].T
+        try:
+            return np.array(mutual_info_regression(x_data, y), dtype=float)
+        except ValueError:
+            return np.full(len(self._feature_cols), np.nan)
+
+    def get_binned_mutual_info(self, steps: list[int], bins: int | None = None):
+        """
+        Computes the MI between the target column and every feature column shifted by each step, from the histograms of
+        equal-frequency bins. The values are binned once; from one step to the next, the marginal counts are updated by
+        removing the rows that leave the overlap, and the joint counts are re-counted in one pass.
+
+        :param steps: Data transformation steps (in increasing order).
+        :param bins: Number of bins (the default follows Sturges' rule).
+        :return: A generator of the MI of every feature (one array per step)
+        """
+        n = self.row_count
+        bins = int(np.ceil(np.log2(n))) + 1 if bins is None else bins
+        tgt_bins = TGradAMI.get_rank_bins(self.full_attr_data[self.target_col], bins)
+        feature_bins = [TGradAMI.get_rank_bins(self.full_attr_data[col], bins) for col in self._feature_cols]
+
+        tgt_counts = np.bincount(tgt_bins, minlength=bins)
+        feature_counts = [np.bincount(col_bins, minlength=bins) for col_bins in feature_bins]
+        prev_step = 0
+        for step in steps:
+            size = n - step
+            # Remove the rows that leave the overlap: target rows [n-step, n-prev_step), feature rows [prev_step, step)
+            tgt_counts = tgt_counts - np.bincount(tgt_bins[size: n - prev_step], minlength=bins)
+            mi_vals = np.zeros(len(feature_bins))
+            for k, col_bins in enumerate(feature_bins):
+                feature_counts[k] = feature_counts[k] - np.bincount(col_bins[prev_step: step], minlength=bins)
+                joint_counts = np.bincount(tgt_bins[0: size] * bins + col_bins[step: n], minlength=bins * bins)
+                joint_counts = joint_counts.reshape(bins, bins)
+                rows, cols = np.nonzero(joint_counts)
+                p_joint = joint_counts[rows, cols] / size
+                mi_vals[k] = np.sum(p_joint * np.log(joint_counts[rows, cols] * size /
+                                                     (tgt_counts[rows] * feature_counts[k][cols])))
+            prev_step = step
+            yield mi_vals
+
+    def _scan_mutual_info(self, steps: list[int], num_cores: int = 1):
+        """
+        Computes the (k-NN) MI of the steps in order, lazily, so that the scan can be stopped early. With num_cores > 1,
+        the steps are computed in waves of num_cores steps by the worker pool.
+
+        :param steps: Data transformation steps.
+        :param num_cores: Number of CPU cores.
+        :return: A generator of (step, MI of every feature) tuples
+        """
+        if num_cores <= 1:
+            for step in steps:
+                yield step, self.get_mutual_info(step)
+            return
+        pool = self._get_step_pool(num_cores)
+        for i in range(0, len(steps), num_cores):
+            wave = steps[i: i + num_cores]
+            yield from zip(wave, pool.map(TGradAMI._get_worker_mutual_info, wave))
+
+    @staticmethod
+    def _get_worker_mutual_info(step: int) -> np.ndarray:
+        """Computes the (k-NN) MI of a step in a worker process (see TGrad._init_step_worker)."""
+        return TGrad._get_worker_miner().get_mutual_info(step)
+
+    @staticmethod
+    def get_rank_bins(col_data: np.ndarray, bins: int) -> np.ndarray:
+        """
+        Assigns the values of a column to equal-frequency bins (by rank; tied values share a bin).
+
+        :param col_data: Numeric values of the attribute.
+        :param bins: Number of bins.
+        :return: The bin of every value
+        """
+        ranks = TGrad.get_ranks(col_data)
+        return np.minimum(((ranks - 1) * bins / col_data.size).astype(int), bins - 1)
+
+    def gather_delayed_data(self, optimal_dict: dict, max_step: int) -> tuple[list[np.ndarray], np.ndarray]:
         """
         A method that combined attribute data with different data transformations and computes the corresponding
-        time-delay values for each attribute.
+        time-delay values for each attribute. The transformed dataset is not copied: every column is a view (slice) of
+        its row in the full attribute data, so it can be passed to fit_bitmap directly.
 
         :param optimal_dict: Raw transformed dataset.
         :param max_step: Largest data transformation step.
-        :return: Combined transformed dataset with corresponding time-delay values.
+        :return: Combined transformed dataset (a view of every column) with corresponding time-delay values (one row
+        per feature).
         """
 
-        delayed_data: np.ndarray|None = None
-        time_data = []
         n = self.row_count
         k = (n - max_step)  # Number of rows created by the largest step-delay
+        delayed_cols = [col for col in range(self.col_count)
+                        if (col != self.target_col) and (col not in self.time_cols)]
+        delayed_data: list[np.ndarray] = []
+        time_data = np.empty((len(delayed_cols), k), dtype=float)
         for col_index in range(self.col_count):
-            if (col_index == self.target_col) or (col_index in self.time_cols):
+            if col_index not in delayed_cols:
                 # date-time column OR target column
-                temp_row = self.full_attr_data[col_index][0: k]
+                delayed_data.append(self.full_attr_data[col_index][0: k])
             else:
-                # other attributes
+                # other attributes: first k items for delayed data and for time-lag data
                 step = optimal_dict[col_index]
-                temp_row = self.full_attr_data[col_index][step: n]
+                delayed_data.append(self.full_attr_data[col_index][step: step + k])
                 _, time_diffs = self.get_time_diffs(step)
-
-                # Get first k items for delayed data
-                temp_row = temp_row[0: k]
-
-                # Get first k items for time-lag data
-                temp_diffs = [(time_diffs[i]) for i in range(k)]
-                time_data.append(temp_diffs)
-
-                # for i in range(k):
-                #    if i in time_dict:
-                #        time_dict[i].append(time_diffs[i])
-                #    else:
-                #        time_dict[i] = [time_diffs[i]]
-                # print(f"{time_diffs}\n")
-                # WHAT ABOUT TIME DIFFERENCE/DELAY? It is different for every step!!!
-            delayed_data = temp_row if (delayed_data is None) \
-                else np.vstack((delayed_data, temp_row))
-
-        time_data = np.array(time_data)
+                time_data[delayed_cols.index(col_index)] = time_diffs[0: k]
         return delayed_data, time_data
 
-    def discover_tgp(self, use_clustering: bool = False, transformation_steps: dict = None, eval_mode: bool = False):
+    def discover_tgp(self, use_clustering: bool | str = False, transformation_steps: dict = None, eval_mode: bool = False,
+                     mi_estimator: str = 'knn', num_cores: int = 1):
         """
         A method that applies mutual information concept, clustering, and hill-climbing algorithm to find the best data
         transformation that maintains MI and estimate the best time-delay value of the mined Fuzzy Temporal Gradual
         Patterns (FTGPs).
 
-        :param use_clustering: Use a clustering algorithm to estimate the best time-delay value.
+        :param use_clustering: Use a clustering algorithm to estimate the best time-delay value: 'kmeans' (also used if
+        True) or 'dp' (exact 1-D clustering, faster).
         :param transformation_steps: Data transformation steps (used to override the computed transformation steps).
         :param eval_mode: Run algorithm in evaluation mode.
+        :param mi_estimator: MI estimator: 'knn' (default) or 'binned' (see find_best_mutual_info).
+        :param num_cores: Number of CPU cores used to compute the MI of the transformation steps.
         :return: List of (FTGPs as DICT object) or (FTGPs and evaluation data as a Python dict) when executed in evaluation mode.
         """
 
@@ -185,7 +271,7 @@ class TGradAMI(TGrad):
                 if v > max_step:
                     max_step = v
         else:
-            optimal_dict, max_step = self.find_best_mutual_info()
+            optimal_dict, max_step = self.find_best_mutual_info(estimator=mi_estimator, num_cores=num_cores)
 
         # 2. Create a final (and dynamic) delayed dataset
         delayed_data, time_data = self.gather_delayed_data(optimal_dict, max_step)
@@ -210,7 +296,7 @@ class TGradAMI(TGrad):
                 'Patterns': self.display_patterns,
                 'Transformation Steps': optimal_dict,
                 'Time Data': np.vstack((np.array(time_title), time_data.T)),
-                'Transformed Data': np.vstack((np.array(title_row), delayed_data.T if delayed_data is not None else np.array([]))),
+                'Transformed Data': np.vstack((np.array(title_row), np.array(delayed_data).T)),
             }
         else:
             add_dict = {"Patterns": self.display_patterns}
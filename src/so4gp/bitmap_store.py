@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GNU GPL v3
+# This file is licensed under the terms of the GNU GPL v3.0.
+# See the LICENSE file at the root of this
+# repository for complete details.
+
+"""
+@author: Dickson Owuor
+@credits: Thomas Runkler, Edmond Menya, and Anne Laurent
+@license: GNU GPL v3
+@email: owuordickson@gmail.com
+@created: 17 October 2026
+@modified: 17 October 2026
+
+An on-disk (memory-mapped) store of gradual item bitmaps for out-of-core mining.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+
+
+class BitmapStore:
+
+    def __init__(self, store_dir: str):
+        """
+        A directory of memory-mapped bitmaps (pairwise matrices). Every bitmap is stored as a '.npy' file whose name is a
+        key computed from the column values and the encoding options (see get_key), together with a '.json' file that
+        holds its pair count. Therefore, the bitmaps can be reopened (read-only) by later runs and by worker processes
+        without recomputation.
+
+        >>> import numpy as np
+        >>> import so4gp as sgp
+        >>> store = sgp.BitmapStore("bitmaps")  # doctest: +SKIP
+        >>> col_data = np.array([1, 3, 2], dtype=float)
+        >>> key = sgp.BitmapStore.get_key(col_data, eq=False, packed=False)
+        >>> bin_mat = store.create(key, (3, 3), bool)  # doctest: +SKIP
+        >>> bin_mat[:] = col_data > col_data[:, np.newaxis]  # doctest: +SKIP
+        >>> store.commit(key, pair_count=3)  # doctest: +SKIP
+        >>> store.open(key)  # doctest: +SKIP
+
+        :param store_dir: Directory where the bitmaps are stored (it is created if it does not exist)
+        """
+        self._store_dir: str = os.path.abspath(store_dir)
+        os.makedirs(self._store_dir, exist_ok=True)
+
+    @property
+    def store_dir(self) -> str:
+        return self._store_dir
+
+    def get_path(self, key: str, part: bool = False) -> str:
+        """
+        Returns the path of a bitmap file.
+
+        :param key: Bitmap key
+        :param part: If True, returns the path of the (partially written) file before it is committed
+        :return: File path
+        """
+        return os.path.join(self._store_dir, f"{key}.npy.part" if part else f"{key}.npy")
+
+    def contains(self, key: str) -> bool:
+        """Checks if a committed bitmap exists for the key"""
+        return os.path.exists(self.get_path(key)) and os.path.exists(os.path.join(self._store_dir, f"{key}.json"))
+
+    def open(self, key: str, mode: str = 'r') -> tuple[np.ndarray, int]:
+        """
+        Opens a committed bitmap as a memory-mapped array.
+
+        :param key: Bitmap key
+        :param mode: Memory-map mode ('r' for read-only, 'r+' for read-write)
+        :return: The memory-mapped bitmap and its pair count
+        """
+        with open(os.path.join(self._store_dir, f"{key}.json"), 'r') as f:
+            meta = json.load(f)
+        bin_mat = np.load(self.get_path(key), mmap_mode=mode)
+        return bin_mat, int(meta['count'])
+
+    def create(self, key: str, shape: tuple[int, int], dtype) -> np.ndarray:
+        """
+        Creates a memory-mapped file for a new bitmap. It only becomes visible to open() after commit().
+
+        :param key: Bitmap key
+        :param shape: Shape of the bitmap
+        :param dtype: Data type of the bitmap
+        :return: A writable memory-mapped array
+        """
+        return np.lib.format.open_memmap(self.get_path(key, part=True), mode='w+', dtype=dtype, shape=shape)
+
+    def commit(self, key: str, pair_count: int) -> None:
+        """
+        Publishes a bitmap that was written through create(). The '.json' file is written to a temporary file and
+        renamed first, and the '.npy' file is renamed last: both renames are atomic, so a bitmap is never visible (see
+        contains) without its complete pair count, even to another process or after a crash.
+
+        :param key: Bitmap key
+        :param pair_count: Number of pairs in the bitmap
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self._store_dir, prefix=f"{key}.", suffix=".json.part")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'count': int(pair_count)}, f)
+            os.replace(tmp_path, os.path.join(self._store_dir, f"{key}.json"))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        os.replace(self.get_path(key, part=True), self.get_path(key))
+
+    def allocate(self, shape: tuple[int, int], dtype) -> np.ndarray:
+        """
+        Allocates a scratch bitmap (e.g., for the result of an AND operation) in an anonymous file of the store
+        directory. The file is deleted as soon as the array is released.
+
+        :param shape: Shape of the bitmap
+        :param dtype: Data type of the bitmap
+        :return: A writable memory-mapped array
+        """
+        with tempfile.TemporaryFile(dir=self._store_dir) as tmp:
+            return np.memmap(tmp, dtype=dtype, mode='w+', shape=shape)
+
+    @staticmethod
+    def get_key(col_data: np.ndarray, eq: bool, packed: bool) -> str:
+        """
+        Computes the key of the bitmap of an attribute column from its values and the encoding options.
+
+        :param col_data: Numeric values of the attribute
+        :param eq: Encode equal values as gradual
+        :param packed: Bit-packed bitmap
+        :return: Key (hex digest)
+        """
+        hasher = hashlib.sha1()
+        hasher.update(np.ascontiguousarray(col_data, dtype=float).tobytes())
+        hasher.update(f"|n={col_data.size}|eq={int(eq)}|packed={int(packed)}".encode())
+        return hasher.hexdigest()
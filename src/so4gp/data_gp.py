@@ -17,19 +17,33 @@ A collection of classes for pre-processing data for mining gradual patterns.
 
 import gc
 import csv
+import gzip
 import time
 import statistics
 import numpy as np
 import pandas as pd
 from tabulate import tabulate
+from dateutil import tz
 from dateutil.parser import parse
-from .utils import write_file
-from .gradual_patterns import GP, TGP, PairwiseMatrix
+from pandas.tseries.api import guess_datetime_format
+from collections import deque
+from multiprocessing import shared_memory
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from .utils import write_file, get_num_cores
+from .gradual_patterns import GI, GP, TGP, PairwiseMatrix, ValidBins
+from .support_engine import SupportEngine
+from .bitmap_store import BitmapStore
+from .fit_cache import FitCache
 
 
 class DataGP:
 
-    def __init__(self, data_source, min_sup=0.5, eq=False) -> None:
+    INVALID_TIME = np.iinfo(np.int64).min
+    """The epoch recorded for a date-time value that cannot be parsed."""
+
+    def __init__(self, data_source, min_sup=0.5, eq=False, packed=False, engine='bitmap', tile_size=None,
+                 memory_budget=None, n_jobs=1, executor='thread', store_dir=None, cache_dir=None,
+                 cache_size=None, dtype=np.float64, usecols=None) -> None:
         """
         A class for creating data-gp objects. A data-gp object is meant to store all the parameters required by GP
         algorithms to extract gradual patterns (GP). It takes a numeric file (in CSV format) as input and converts it
@@ -44,20 +58,92 @@ class DataGP:
         :param eq: [optional] encode equal values as gradual, the default is False
         :type eq: bool
 
+        :param packed: [optional] store the bitmaps bit-packed (8 object pairs per byte), the default is False
+        :type packed: bool
+
+        :param engine: [optional] 'bitmap' (default) computes supports from n×n pairwise matrices; 'rank' computes them
+        matrix-free through rank/dominance counting (see SupportEngine)
+        :type engine: str
+
+        :param tile_size: [optional] number of rows compared per block (tile) when building a bitmap, the default is
+        all rows at once (or the size allowed by memory_budget)
+        :type tile_size: int | None
+
+        :param memory_budget: [optional] memory (in MiB) allowed for the temporary tiles of a bitmap (per worker); it
+        picks the tile size if tile_size is not set
+        :type memory_budget: float | None
+
+        :param n_jobs: [optional] number of attribute columns whose bitmaps are built concurrently, the default is 1;
+        -1 uses all the available CPU cores (SLURM aware)
+        :type n_jobs: int
+
+        :param executor: [optional] 'thread' (default) builds the bitmaps in threads (NumPy releases the GIL for the
+        comparisons); 'process' builds them in worker processes that write into shared memory
+        :type executor: str
+
+        :param store_dir: [optional] a directory where the bitmaps are kept as memory-mapped files (see BitmapStore)
+        for datasets whose bitmaps exceed the available memory; bitmaps already stored for the same column values are
+        reopened instead of being rebuilt. The default is None (bitmaps are kept in memory)
+        :type store_dir: str | None
+
+        :param cache_dir: [optional] a directory for a persistent cache (see FitCache) of the fitted pairwise structures,
+        keyed by a fingerprint of the cleaned data and eq. It is shared by data-gp objects and processes that mine the
+        same dataset (with any min_sup). The default is None (no cache)
+        :type cache_dir: str | None
+
+        :param cache_size: [optional] maximum size (in MiB) of the cache; the least-recently-used datasets are evicted
+        beyond it. The default is None (no limit)
+        :type cache_size: float | None
+
+        :param dtype: [optional] floating-point type (np.float64 or np.float32) of the attribute matrix, the default is
+        np.float64
+        :type dtype: type
+
+        :param usecols: [optional] the columns (indices or titles) loaded from a CSV file, the default is all columns
+        :type usecols: list | None
+
         """
+        if engine not in ('bitmap', 'rank'):
+            raise ValueError("Invalid support engine. It should be either 'bitmap' or 'rank'.")
+        if executor not in ('thread', 'process'):
+            raise ValueError("Invalid executor. It should be either 'thread' or 'process'.")
+        if np.dtype(dtype) not in (np.dtype(np.float64), np.dtype(np.float32)):
+            raise ValueError("Invalid dtype. It should be either np.float64 or np.float32.")
         self._data_src = data_source
         self._thd_supp: float = min_sup
         self._include_equal_values: bool = eq
-        self._titles, self._data = DataGP.read(data_source)
-        """:type _titles: list"""
-        """:type _data: np.ndarray"""
+        self._packed: bool = packed
+        self._engine: str = engine
+        self._tile_size: int | None = tile_size
+        self._memory_budget: float | None = memory_budget
+        self._n_jobs: int = get_num_cores() if n_jobs == -1 else max(1, int(n_jobs))
+        self._executor: str = executor
+        self._bitmap_store: BitmapStore | None = BitmapStore(store_dir) if store_dir is not None else None
+        self._fit_cache: FitCache | None = FitCache(cache_dir, cache_size) if cache_dir is not None else None
+        self._fingerprint: str | None = None
+        self._dtype: np.dtype = np.dtype(dtype)
         self._row_count: int = 0
         self._col_count: int = 0
         self._time_cols: np.ndarray = np.array([])
         self._attr_cols: np.ndarray = np.array([])
-        self._valid_bins: dict | None = None
+        self._attr_data: np.ndarray = np.empty((0, 0), dtype=self._dtype)
+        self._time_data: np.ndarray = np.empty((0, 0), dtype=np.int64)
+        self._time_values: list[np.ndarray] = []
+        if isinstance(data_source, pd.DataFrame):
+            self._dropped_rows: int = int(data_source.isna().any(axis=1).sum())
+            self._titles, self._data = DataGP.read(data_source)
+        else:
+            # CSV file: parsed (chunk by chunk) straight into the typed arrays
+            self._data = None
+            (self._titles, self._attr_data, self._time_cols, self._time_values,
+             self._dropped_rows) = DataGP.read_csv(data_source, usecols=usecols, dtype=self._dtype)
+        """:type _titles: list"""
+        """:type _data: np.ndarray | None"""
+        self._valid_bins: ValidBins | None = None
         self._warping_set: dict | None = None
         self._attr_size: int = 0
+        self._pattern_counts: dict[tuple[str, ...], int] = {}
+        self._bitmap_buffers: dict[int, np.ndarray] = {}
         self._gradual_patterns = None
         """:type _gradual_patterns: list[GP] | None"""
         self._init_attributes()
@@ -66,14 +152,75 @@ class DataGP:
     def thd_supp(self) -> float:
         return self._thd_supp
 
+    @property
+    def packed(self) -> bool:
+        return self._packed
+
+    @property
+    def engine(self) -> str:
+        return self._engine
+
+    @property
+    def tile_size(self) -> int | None:
+        return self._tile_size
+
+    @property
+    def memory_budget(self) -> float | None:
+        return self._memory_budget
+
+    @property
+    def n_jobs(self) -> int:
+        return self._n_jobs
+
+    @property
+    def store_dir(self) -> str | None:
+        return self._bitmap_store.store_dir if self._bitmap_store is not None else None
+
+    @property
+    def fit_cache(self) -> FitCache | None:
+        return self._fit_cache
+
+    @property
+    def fingerprint(self) -> str:
+        """The fingerprint of the cleaned data and eq (see FitCache)"""
+        if self._fingerprint is None:
+            self._fingerprint = FitCache.get_fingerprint(self._attr_data, self._include_equal_values)
+        return self._fingerprint
+
+    @property
+    def support_engine(self) -> SupportEngine | None:
+        return self._valid_bins.support_engine if self._valid_bins is not None else None
+
     @property
     def titles(self) -> list:
         return self._titles
 
     @property
     def data(self) -> np.ndarray:
+        if self._data is None:
+            # The CSV loader only keeps the typed arrays; the (object) data array is materialized on demand
+            data = self._attr_data.T.astype(object)
+            for k, col in enumerate(self._time_cols):
+                data[:, col] = self._time_values[k]
+            self._data = data
         return self._data
 
+    @property
+    def dropped_rows(self) -> int:
+        """The number of rows dropped while loading the data (because of missing or non-numeric values)"""
+        return self._dropped_rows
+
+    @property
+    def attr_data(self) -> np.ndarray:
+        """The numeric columns as a (col_count × row_count) float matrix: every column is a contiguous row. The rows
+        of the time columns hold their epoch (in seconds)."""
+        return self._attr_data
+
+    @property
+    def time_data(self) -> np.ndarray:
+        """The epochs (int64 seconds) of the time columns, one row per column in time_cols"""
+        return self._time_data
+
     @property
     def row_count(self) -> int:
         return self._row_count
@@ -91,7 +238,7 @@ class DataGP:
         return self._attr_cols
 
     @property
-    def valid_bins(self) -> dict | None:
+    def valid_bins(self) -> ValidBins | None:
         return self._valid_bins
 
     @property
@@ -150,22 +297,39 @@ class DataGP:
 
             :return: A ndarray object containing the indices of the time columns.
             """
-            # Retrieve the first column only
-            time_cols = list()
-            n = self._col_count
-            for i in range(n):  # check every column/attribute for time format
-                row_data = str(self._data[0][i])
-                try:
-                    time_ok, t_stamp = DataGP.test_time(row_data)
-                    if time_ok:
-                        time_cols.append(i)
-                except ValueError:
-                    continue
+            # Test a sample of every column/attribute for time format
+            time_cols = [i for i in range(self._col_count) if DataGP.is_time_column(self._data[:, i])]
             return np.array(time_cols)
 
+        def build_columns() -> tuple[np.ndarray, np.ndarray]:
+            """
+            Converts the columns (once) into typed arrays: a float matrix with one contiguous row per column and the
+            int64 epochs of the time columns.
+
+            :return: The attribute matrix and the time (epoch) matrix
+            """
+            attr_data = np.zeros((self._col_count, self._row_count), dtype=self._dtype)
+            time_data = np.zeros((self._time_cols.size, self._row_count), dtype=np.int64)
+            for col in self._attr_cols:
+                attr_data[col] = self._data[:, col].astype(self._dtype)
+            for k, col in enumerate(self._time_cols):
+                time_data[k] = DataGP.parse_time_column(self._data[:, col])
+                attr_data[col] = time_data[k]
+            return attr_data, time_data
+
+        if self._data is None:
+            # Typed arrays were created by the CSV loader: only the epochs are missing
+            self._col_count, self._row_count = self._attr_data.shape
+            self._attr_cols = get_attr_cols()
+            self._time_data = np.zeros((self._time_cols.size, self._row_count), dtype=np.int64)
+            for k, col in enumerate(self._time_cols):
+                self._time_data[k] = DataGP.parse_time_column(self._time_values[k])
+                self._attr_data[col] = self._time_data[k]
+            return
         self._row_count, self._col_count = self._data.shape
         self._time_cols = get_time_cols()
         self._attr_cols = get_attr_cols()
+        self._attr_data, self._time_data = build_columns()
 
     def add_gradual_pattern(self, pattern) -> None:
         """
@@ -188,6 +352,19 @@ class DataGP:
         """
         Remove subset GPs from the list.
 
+        >>> import pandas
+        >>> import so4gp as sgp
+        >>> d_gp = sgp.DataGP(pandas.DataFrame([[1, 2, 3], [2, 3, 1], [3, 1, 2]], columns=['A', 'B', 'C']))
+        >>> gp_list = []
+        >>> for gi_pair in (('0+', '1+'), ('0+', '2-'), ('1+', '2-'), ('0+', '1-')):
+        ...     gp = sgp.GP()
+        ...     for gi_str in gi_pair:
+        ...         _ = gp.add_gradual_item(sgp.GI.from_string(gi_str))
+        ...     gp_list.append(gp)
+        >>> d_gp.remove_subsets({'0+', '1+', '2-'}, gp_list)
+        >>> [gp.to_string() for gp in gp_list]
+        [['0+', '1-']]
+
         :param gi_arr: Gradual items in an array
         :param gradual_patterns: List of gradual patterns (if None, use the object's GPs)
         :return: List of GPs
@@ -196,54 +373,568 @@ class DataGP:
         if gps is None:
             return
 
-        for gp in gps:
-            result1 = set(gp.as_set).issubset(gi_arr)
-            result2 = set(gp.as_swapped_set).issubset(gi_arr)
-            if result1 or result2:
-                gps.remove(gp)
+        # The list is filtered in place (removing items while iterating over it would skip the next item)
+        gps[:] = [gp for gp in gps if not (set(gp.as_set).issubset(gi_arr) or set(gp.as_swapped_set).issubset(gi_arr))]
 
     def fit_bitmap(self, attr_data=None) -> None:
         """
         Generates bitmaps for columns with numeric objects. It stores the bitmaps in attribute valid_bins (those bitmaps
-        whose computed support values are greater or equal to the minimum support threshold value).
+        whose computed support values are greater or equal to the minimum support threshold value). Only the bitmap of
+        the increasing item 'col+' is stored; 'col-' is served by valid_bins as its transpose. With the 'rank' engine,
+        no bitmap is built: only the supports are stored and valid_bins carries the SupportEngine.
 
-        :param attr_data: Stepped attribute objects
-        :type attr_data: np.ndarray | None
+        :param attr_data: Stepped attribute objects (one row or view per column), the default is the attribute matrix
+        :type attr_data: np.ndarray | list[np.ndarray] | None
         :return: void
         """
-        # (check) implement parallel multiprocessing
-        # 1. Transpose csv array data
+        # 1. Fetch the (column-major) attribute data
+        track_counts = attr_data is None
         if attr_data is None:
-            attr_data = self._data.T
+            attr_data = self._attr_data
             self._attr_size = self._row_count
         else:
             self._attr_size = len(attr_data[self._attr_cols[0]])
+        # The pair counts of the 1-itemsets are tracked (see append_rows) only if the whole dataset is fitted
+        self._pattern_counts = {}
+        self._bitmap_buffers = {}
 
         # 2. Construct and store 1-item_set valid bins
         # execute binary rank to calculate support of a pattern
         n = self._attr_size
-        self._valid_bins = {}
-        for col in self._attr_cols:
-            # 2a. Generate 1-itemset gradual-items
-            col_data = np.array(attr_data[col], dtype=float)
-            with np.errstate(invalid='ignore'):
-                if not self._include_equal_values:
-                    temp_pos = np.array(col_data > col_data[:, np.newaxis])
-                else:
-                    temp_pos = np.array(col_data >= col_data[:, np.newaxis])
-                    np.fill_diagonal(temp_pos, False)
-
+        if self._engine == 'rank':
+            self._valid_bins = ValidBins(support_engine=SupportEngine(attr_data, self._attr_cols,
+                                                                      eq=self._include_equal_values))
+        else:
+            self._valid_bins = ValidBins()
+        if self._valid_bins.support_engine is not None:
+            for col in self._attr_cols:
+                # 2a. Matrix-free: only compute the support of the gradual item
+                supp = self._valid_bins.support_engine.support([GI(col, "+")])
+                if track_counts:
+                    self._pattern_counts[(f"{col}+",)] = self._valid_bins.support_engine.count([GI(col, "+")])
+                if supp >= self._thd_supp:
+                    self._valid_bins.add(col, PairwiseMatrix(bin_mat=None, support=supp))
+        else:
+            # 2a. Generate 1-itemset gradual-items (the columns are independent, so they may be built concurrently)
+            col_arrays = [DataGP.as_float(attr_data[col]) for col in self._attr_cols]
+            for col, (bin_mat, pair_count) in zip(self._attr_cols, self._build_bitmaps(col_arrays, use_cache=track_counts)):
                 # 2b. Check support of each generated item set
-                supp = float(np.sum(temp_pos)) / float(n * (n - 1.0) / 2.0)
+                supp = float(pair_count) / float(n * (n - 1.0) / 2.0)
+                if track_counts:
+                    self._pattern_counts[(f"{col}+",)] = int(pair_count)
                 if (supp >= self._thd_supp )and (self._valid_bins is not None):
-                    self._valid_bins[f"{col}+"] = PairwiseMatrix(bin_mat=temp_pos, support=supp)
-                    self._valid_bins[f"{col}-"] = PairwiseMatrix(bin_mat=temp_pos.T, support=supp)
+                    self._valid_bins.add(col, PairwiseMatrix(bin_mat=bin_mat, support=supp, packed=self._packed))
         # print(self._valid_bins)
         valid_bins_len = len(self._valid_bins) if self._valid_bins is not None else 0
         if valid_bins_len < 3:
             self._valid_bins = None
+        if self._fit_cache is not None:
+            self._fit_cache.evict(keep=self.fingerprint)
         gc.collect()
 
+    def fit_bitmap_views(self, bitmaps: dict[int, tuple[np.ndarray, int]], attr_size: int) -> None:
+        """
+        Stores precomputed bitmaps of the attribute columns (e.g., zero-copy sub-blocks of larger bitmaps) as the valid
+        bins. Like fit_bitmap, only the bitmaps whose support reaches the minimum support threshold are kept.
+
+        :param bitmaps: The bitmap of the gradual item 'col+' and its pair count for every attribute column
+        :param attr_size: The number of objects covered by the bitmaps
+        :return: void
+        """
+        self._attr_size = attr_size
+        n = attr_size
+        self._valid_bins = ValidBins()
+        for col, (bin_mat, pair_count) in bitmaps.items():
+            supp = float(pair_count) / float(n * (n - 1.0) / 2.0)
+            if supp >= self._thd_supp:
+                self._valid_bins.add(col, PairwiseMatrix(bin_mat=bin_mat, support=supp, packed=self._packed))
+        if len(self._valid_bins) < 3:
+            self._valid_bins = None
+
+    def track_pattern(self, gi_strs, support: float) -> None:
+        """
+        Records the support of a pattern (as a count of object pairs) so that append_rows keeps it up to date. The
+        support must be computed on the whole dataset (i.e., after fit_bitmap without stepped data).
+
+        :param gi_strs: Gradual items of the pattern as strings (e.g., ['0+', '2-'])
+        :param support: Support of the pattern
+        :return: void
+        """
+        n = self._attr_size
+        self._pattern_counts[DataGP.get_pattern_key(gi_strs)] = int(round(support * n * (n - 1) / 2))
+
+    @staticmethod
+    def get_pattern_key(gi_strs) -> tuple[str, ...]:
+        """
+        Returns the canonical key of a pattern: its gradual items sorted by column, in the orientation whose first item
+        is increasing. A pattern and its inverse (which has the same support) share the key.
+
+        :param gi_strs: Gradual items of the pattern as strings (e.g., ['2-', '0-'])
+        :return: A tuple of gradual items (e.g., ('0+', '2+'))
+        """
+        gi_strs = sorted(gi_strs, key=lambda gi_str: int(gi_str[:-1]))
+        if len(gi_strs) > 0 and gi_strs[0].endswith("-"):
+            gi_strs = [gi_str[:-1] + ("+" if gi_str.endswith("-") else "-") for gi_str in gi_strs]
+        return tuple(gi_strs)
+
+    def append_rows(self, rows) -> dict:
+        """
+        Appends new objects (rows) to the dataset and updates the pairwise structures and the supports incrementally:
+        only the pairs formed by the new objects are compared, so a batch of b rows costs O(b·n) work instead of the
+        O(n²) work of a new fit.
+
+        The pair counts of the 1-itemsets and of the patterns evaluated by the last mining run (see track_pattern) are
+        updated, and the patterns whose support crossed the minimum support threshold (in either direction) are
+        reported. The supports of the extracted gradual patterns are updated and the patterns that are no longer
+        frequent are removed; the patterns that emerged are only reported (discover extends them into larger
+        patterns). In-memory bitmaps of the valid bins are extended by the new rows and columns inside buffers that grow
+        geometrically, so the copies are amortized; a gradual item that becomes frequent has its bitmap built once.
+        With the 'rank' engine, the ranks are recomputed (O(n log n) per attribute). Packed or memory-mapped bitmaps are
+        not extended: valid_bins is reset and fit_bitmap rebuilds them.
+
+        >>> import pandas
+        >>> from so4gp.algorithms import GRAANK
+        >>> dummy_data = [[8, 1, 2, 3], [2, 8, 8, 6], [1, 1, 3, 4], [6, 5, 3, 2], [7, 7, 1, 2], [5, 4, 8, 5], [4, 4, 6, 6]]
+        >>> mine_obj = GRAANK(data_source=pandas.DataFrame(dummy_data, columns=['A', 'B', 'C', 'D']), min_sup=0.5)
+        >>> result_json = mine_obj.discover()
+        >>> changes = mine_obj.append_rows([[2, 7, 7, 9]])
+        >>> [(gp.to_string(), gp.support) for gp in mine_obj.gradual_patterns]
+        [(['0+', '2-', '3-'], 0.536)]
+        >>> [(gp.to_string(), gp.support) for gp in changes["Emerged Patterns"]]
+        [(['1+', '2+'], 0.536)]
+
+        :param rows: New objects with the columns of the dataset (a DataFrame with the same titles, or a 2-D array)
+        :type rows: pd.DataFrame | np.ndarray | list
+        :return: The number of appended rows and the emerged and vanished patterns (GP objects with their new support)
+        """
+
+        def to_support(pair_count: int, obj_count: int) -> float:
+            return float(pair_count) / float(obj_count * (obj_count - 1.0) / 2.0) if obj_count > 1 else 0.0
+
+        def is_frequent(gp_key: tuple, supp: float) -> bool:
+            # Gradual items are kept from min_sup (fit_bitmap) and larger candidates above it (GRAANK)
+            return supp >= self._thd_supp if len(gp_key) == 1 else supp > self._thd_supp
+
+        # 1. Convert the new objects into typed columns
+        new_data, new_attr, new_time = self._parse_rows(rows)
+
+        n_old = self._row_count
+        n = n_old + new_data.shape[0]
+        changes: dict[str, int | list[GP]] = {"Appended Rows": n - n_old, "Emerged Patterns": [],
+                                              "Vanished Patterns": []}
+        if n == n_old:
+            return changes
+        attr_data = np.concatenate((self._attr_data, new_attr), axis=1)
+
+        # 2. Update the pair counts of the tracked patterns with the pairs formed by the new objects
+        vanished_keys = set()
+        for gp_key, pair_count in self._pattern_counts.items():
+            gi_list = [GI.from_string(gi_str) for gi_str in gp_key]
+            new_count = pair_count + DataGP.count_pairs(attr_data, gi_list, n_old, n, eq=self._include_equal_values)
+            self._pattern_counts[gp_key] = new_count
+            was_valid = is_frequent(gp_key, to_support(pair_count, n_old))
+            is_valid = is_frequent(gp_key, to_support(new_count, n))
+            if was_valid != is_valid:
+                gp: GP = GP()
+                for gi in gi_list:
+                    gp.add_gradual_item(gi)
+                gp.support = to_support(new_count, n)
+                changes["Emerged Patterns" if is_valid else "Vanished Patterns"].append(gp)
+                if not is_valid:
+                    vanished_keys.add(gp_key)
+
+        # 3. Extend the typed data
+        self._attr_data = attr_data
+        self._time_data = np.concatenate((self._time_data, new_time), axis=1)
+        if self._data is not None:
+            self._data = np.vstack((self._data, new_data))
+        else:
+            self._time_values = [np.concatenate((self._time_values[k], new_data[:, col]))
+                                 for k, col in enumerate(self._time_cols)]
+        self._row_count = n
+        self._fingerprint = None
+        self._warping_set = None
+
+        # 4. Extend the valid bins
+        item_keys = {col: (f"{col}+",) for col in self._attr_cols}
+        if any(gp_key not in self._pattern_counts for gp_key in item_keys.values()):
+            # The valid bins were not fitted on the whole dataset (e.g., stepped data)
+            self._valid_bins = None
+        elif self._engine == 'rank':
+            self._attr_size = n
+            self._valid_bins = ValidBins(support_engine=SupportEngine(attr_data, self._attr_cols,
+                                                                      eq=self._include_equal_values))
+            for col, gp_key in item_keys.items():
+                supp = to_support(self._pattern_counts[gp_key], n)
+                if supp >= self._thd_supp:
+                    self._valid_bins.add(col, PairwiseMatrix(bin_mat=None, support=supp))
+        elif self._packed or (self._bitmap_store is not None):
+            self._valid_bins = None
+        else:
+            self._attr_size = n
+            old_bins = self._valid_bins
+            self._valid_bins = ValidBins()
+            for col, gp_key in item_keys.items():
+                supp = to_support(self._pattern_counts[gp_key], n)
+                if supp < self._thd_supp:
+                    self._bitmap_buffers.pop(col, None)
+                    continue
+                old_mat = old_bins.canonical(col).bin_mat if (old_bins is not None and
+                                                              col in old_bins.attr_cols) else None
+                bin_mat = self._extend_bitmap(col, old_mat, n_old)
+                self._valid_bins.add(col, PairwiseMatrix(bin_mat=bin_mat, support=supp))
+            if len(self._valid_bins) < 3:
+                self._valid_bins = None
+
+        # 5. Update the supports of the extracted patterns
+        if self._gradual_patterns is not None:
+            for gp in list(self._gradual_patterns):
+                if isinstance(gp, TGP):
+                    # (the support of a temporal GP depends on its transformation step)
+                    continue
+                gp_key = DataGP.get_pattern_key(gp.to_string())
+                if gp_key in self._pattern_counts:
+                    gp.support = to_support(self._pattern_counts[gp_key], n)
+                if gp_key in vanished_keys:
+                    self._gradual_patterns.remove(gp)
+        return changes
+
+    def _parse_rows(self, rows) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Converts new objects (rows) into the typed columns of the dataset. The rows with missing or non-numeric values
+        are dropped (and counted in dropped_rows), like while loading the data.
+
+        :param rows: New objects with the columns of the dataset (a DataFrame with the same titles, or a 2-D array)
+        :return: The object rows, the attribute matrix (one row per column) and the time (epoch) matrix
+        """
+        if isinstance(rows, pd.DataFrame):
+            missing_cols = [col for col in self._titles if col not in rows.columns]
+            if len(missing_cols) > 0:
+                raise ValueError(f"The new rows are missing the columns: {missing_cols}")
+            new_data = rows[self._titles].to_numpy(dtype=object)
+        else:
+            new_data = np.array(rows, dtype=object, ndmin=2)
+        if new_data.ndim != 2 or new_data.shape[1] != self._col_count:
+            raise ValueError(f"The new rows should have {self._col_count} columns.")
+        new_attr = np.zeros((self._col_count, new_data.shape[0]), dtype=self._dtype)
+        new_time = np.zeros((self._time_cols.size, new_data.shape[0]), dtype=np.int64)
+        for col in self._attr_cols:
+            new_attr[col] = pd.to_numeric(pd.Series(new_data[:, col]), errors='coerce').to_numpy(dtype=self._dtype)
+        for k, col in enumerate(self._time_cols):
+            new_time[k] = DataGP.parse_time_column(new_data[:, col])
+            new_attr[col] = new_time[k]
+        keep_rows = ~np.isnan(new_attr).any(axis=0)
+        self._dropped_rows += int(np.count_nonzero(~keep_rows))
+        new_data, new_attr, new_time = new_data[keep_rows], new_attr[:, keep_rows], new_time[:, keep_rows]
+        return new_data, new_attr, new_time
+
+    def _extend_bitmap(self, col: int, old_mat: np.ndarray | None, n_old: int) -> np.ndarray:
+        """
+        Extends the bitmap of the gradual item 'col+' by the objects n_old..n-1: only the new rows and columns are
+        compared. The bitmap lives in a buffer with spare capacity (it grows by half its size when it is full). If
+        the bitmap of the first n_old objects is unknown, the whole bitmap is built.
+
+        :param col: Attribute column
+        :param old_mat: The bitmap of the first n_old objects (None if it is not stored)
+        :param n_old: The number of objects covered by the old bitmap
+        :return: The extended bitmap (an n×n view of the buffer)
+        """
+        col_data = DataGP.as_float(self._attr_data[col])
+        n = col_data.size
+        capacity = n + n // 2
+        buffer = self._bitmap_buffers.get(col)
+        if (buffer is None) and (old_mat is None):
+            buffer = np.empty((capacity, capacity), dtype=bool)
+            DataGP.build_bitmap(col_data, eq=self._include_equal_values, out=buffer[:n, :n])
+            self._bitmap_buffers[col] = buffer
+            return buffer[:n, :n]
+        if (buffer is None) or (buffer.shape[0] < n):
+            new_buffer = np.empty((capacity, capacity), dtype=bool)
+            new_buffer[:n_old, :n_old] = old_mat if buffer is None else buffer[:n_old, :n_old]
+            buffer = new_buffer
+            self._bitmap_buffers[col] = buffer
+
+        bin_mat = buffer[:n, :n]
+        with np.errstate(invalid='ignore'):
+            if not self._include_equal_values:
+                np.greater(col_data[n_old:], col_data[:n_old, np.newaxis], out=bin_mat[:n_old, n_old:])
+                np.greater(col_data, col_data[n_old:, np.newaxis], out=bin_mat[n_old:])
+            else:
+                np.greater_equal(col_data[n_old:], col_data[:n_old, np.newaxis], out=bin_mat[:n_old, n_old:])
+                np.greater_equal(col_data, col_data[n_old:, np.newaxis], out=bin_mat[n_old:])
+                # Clear the diagonal
+                bin_mat[np.arange(n_old, n), np.arange(n_old, n)] = False
+        return bin_mat
+
+    @staticmethod
+    def count_pairs(attr_data: np.ndarray, gi_list: list[GI], r0: int, r1: int, eq: bool = False) -> int:
+        """
+        Counts the ordered object pairs (i, j), i != j, that respect every gradual item and involve at least one of the
+        objects r0..r1-1 (e.g., the objects appended to a dataset). The objects are compared block by block with the
+        others, so it costs O((r1-r0)·n·k) time for k gradual items.
+
+        :param attr_data: Attribute data with one row per column
+        :param gi_list: Gradual items of the pattern
+        :param r0: First object of the range
+        :param r1: End (exclusive) of the range
+        :param eq: Encode equal values as gradual
+        :return: Number of concordant object pairs
+        """
+        compare = np.greater_equal if eq else np.greater
+        # A decreasing item is an increasing item of the negated values
+        signed_data = [DataGP.as_float(attr_data[gi.attribute_col]) if gi.symbol == "+" else
+                       -DataGP.as_float(attr_data[gi.attribute_col]) for gi in gi_list]
+        if len(signed_data) == 0:
+            return 0
+        n = signed_data[0].size
+        block_rows = int(max(1, GP.BLOCK_BYTES // max(2 * n, 1)))
+
+        pair_count = 0
+        with np.errstate(invalid='ignore'):
+            for a in range(r0, r1, block_rows):
+                c = min(a + block_rows, r1)
+                # Every pair is counted once: with the objects before it (within the block) and after the range
+                for lo, hi in ((0, c), (r1, n)):
+                    if hi <= lo:
+                        continue
+                    fwd = np.ones((c - a, hi - lo), dtype=bool)
+                    bwd = np.ones((c - a, hi - lo), dtype=bool)
+                    for values in signed_data:
+                        fwd &= compare(values[lo:hi], values[a:c, np.newaxis])
+                        bwd &= compare(values[a:c, np.newaxis], values[lo:hi])
+                    if lo == 0:
+                        earlier = np.arange(lo, hi) < np.arange(a, c)[:, np.newaxis]
+                        fwd &= earlier
+                        bwd &= earlier
+                    pair_count += int(np.count_nonzero(fwd)) + int(np.count_nonzero(bwd))
+        return pair_count
+
+    def _get_tile_size(self, n: int) -> int:
+        """
+        Returns the number of rows compared per tile when building an n×n bitmap. It uses tile_size if set, otherwise
+        it fits the boolean tile (plus its packed copy) into memory_budget.
+
+        :param n: The number of objects
+        :return: Number of rows per tile
+        """
+        if self._tile_size is not None:
+            return int(max(1, min(self._tile_size, n)))
+        row_bytes = n + (n / 8 if self._packed else 0)
+        if self._memory_budget is not None:
+            return int(max(1, min(n, (self._memory_budget * 1024 * 1024) // row_bytes)))
+        if self._bitmap_store is not None:
+            # Out-of-core: never hold a full n×n tile in memory
+            return int(max(1, min(n, GP.BLOCK_BYTES // max(row_bytes, 1))))
+        return max(n, 1)
+
+    def allocate_bitmap(self) -> np.ndarray | None:
+        """
+        Allocates a scratch bitmap (with the layout of the stored bitmaps) that receives the result of an AND
+        operation. It is a memory-mapped file in store_dir (deleted once released), or None if the bitmaps are kept in
+        memory.
+
+        :return: A memory-mapped array or None
+        """
+        if self._bitmap_store is None:
+            return None
+        shape, dtype = DataGP.get_bitmap_layout(self._attr_size, self._packed)
+        return self._bitmap_store.allocate(shape, dtype)
+
+    def _build_bitmaps(self, col_arrays: list[np.ndarray], use_cache: bool = True):
+        """
+        Builds the bitmaps of several attribute columns, serially or concurrently (n_jobs > 1) in a thread or process
+        pool. The process pool writes every bitmap into a shared memory block, which is copied out as soon as it is
+        done; at most n_jobs blocks are in flight at a time. If a bitmap store (store_dir) or a fit cache is set, the
+        bitmaps are reopened from (or built into) its memory-mapped files instead. The bitmaps are yielded in the order of the columns.
+
+        :param col_arrays: Numeric values of each attribute column
+        :param use_cache: Read and write the bitmaps through the fit cache; only the bitmaps of the whole dataset are
+        cached (the entry of the dataset is never evicted while it is mined, so stepped bitmaps would grow it unbounded)
+        :return: A generator of (bitmap, pair count) tuples
+        """
+        if len(col_arrays) == 0:
+            return
+        n = col_arrays[0].size
+        tile_rows = self._get_tile_size(n)
+        eq = self._include_equal_values
+        packed = self._packed
+        n_jobs = min(self._n_jobs, len(col_arrays))
+
+        store = self._bitmap_store
+        if (store is None) and (self._fit_cache is not None) and use_cache:
+            store = self._fit_cache.get_store(self.fingerprint)
+        if store is not None:
+            keys = [BitmapStore.get_key(col_data, eq, packed) for col_data in col_arrays]
+            self._fill_bitmap_store(store, keys, col_arrays, tile_rows)
+            for key in keys:
+                yield store.open(key)
+        elif n_jobs <= 1:
+            for col_data in col_arrays:
+                yield DataGP.build_bitmap(col_data, eq, packed, tile_rows)
+        elif self._executor == 'thread':
+            with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+                yield from pool.map(lambda c_data: DataGP.build_bitmap(c_data, eq, packed, tile_rows), col_arrays)
+        else:
+            shape, dtype = DataGP.get_bitmap_layout(n, packed)
+
+            def collect_bitmap(shm_block: shared_memory.SharedMemory, future) -> tuple[np.ndarray, int]:
+                """Copies a finished bitmap out of its shared memory block and releases the block."""
+                try:
+                    count = future.result()
+                    return np.ndarray(shape, dtype=dtype, buffer=shm_block.buf).copy(), count
+                finally:
+                    shm_block.close()
+                    shm_block.unlink()
+
+            pending = deque()
+            try:
+                with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                    for col_data in col_arrays:
+                        shm = shared_memory.SharedMemory(create=True, size=max(1, shape[0] * shape[1] * dtype.itemsize))
+                        pending.append((shm, pool.submit(DataGP.build_shared_bitmap, shm.name, col_data, eq, packed,
+                                                         tile_rows)))
+                        if len(pending) >= n_jobs:
+                            yield collect_bitmap(*pending.popleft())
+                    while pending:
+                        yield collect_bitmap(*pending.popleft())
+            finally:
+                for shm, _ in pending:
+                    shm.close()
+                    shm.unlink()
+
+    def _fill_bitmap_store(self, store: BitmapStore, keys: list[str], col_arrays: list[np.ndarray],
+                           tile_rows: int) -> None:
+        """
+        Builds the bitmaps that are missing from a bitmap store straight into their memory-mapped files (serially or
+        concurrently, like _build_bitmaps) and commits them.
+
+        :param store: The bitmap store (store_dir or the cache entry of the dataset)
+        :param keys: Bitmap keys of the attribute columns (see BitmapStore.get_key)
+        :param col_arrays: Numeric values of each attribute column
+        :param tile_rows: Number of rows compared per tile
+        """
+        eq = self._include_equal_values
+        packed = self._packed
+        missing = {key: col_data for key, col_data in zip(keys, col_arrays) if not store.contains(key)}
+        if len(missing) == 0:
+            return
+        shape, dtype = DataGP.get_bitmap_layout(col_arrays[0].size, packed)
+        n_jobs = min(self._n_jobs, len(missing))
+
+        def fill_bitmap(key: str, col_data: np.ndarray) -> int:
+            """Builds one bitmap into a new file of the store."""
+            out = store.create(key, shape, dtype)
+            _, count = DataGP.build_bitmap(col_data, eq, packed, tile_rows, out=out)
+            out.flush()
+            return count
+
+        if n_jobs <= 1:
+            counts = [fill_bitmap(key, col_data) for key, col_data in missing.items()]
+        elif self._executor == 'thread':
+            with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+                counts = list(pool.map(fill_bitmap, missing.keys(), missing.values()))
+        else:
+            # The files are created here and filled (in place) by the worker processes
+            for key in missing:
+                store.create(key, shape, dtype).flush()
+            paths = [store.get_path(key, part=True) for key in missing]
+            k = len(missing)
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                counts = list(pool.map(DataGP.build_stored_bitmap, paths, missing.values(), [eq] * k, [packed] * k,
+                                       [tile_rows] * k))
+        for key, count in zip(missing.keys(), counts):
+            store.commit(key, count)
+
+    @staticmethod
+    def get_bitmap_layout(n: int, packed: bool) -> tuple[tuple[int, int], np.dtype]:
+        """
+        Returns the shape and data type of the bitmap of n objects.
+
+        :param n: The number of objects
+        :param packed: If True, the bitmap is bit-packed into uint64 words
+        :return: The shape and the dtype of the bitmap
+        """
+        if packed:
+            return (n, -(-n // 64)), np.dtype(np.uint64)
+        return (n, n), np.dtype(bool)
+
+    @staticmethod
+    def build_bitmap(col_data: np.ndarray, eq: bool = False, packed: bool = False, tile_rows: int | None = None,
+                     out: np.ndarray | None = None) -> tuple[np.ndarray, int]:
+        """
+        Builds the pairwise (bitmap) matrix of the gradual item 'col+' block by block: each tile of rows is compared
+        against all the objects and written into a preallocated (optionally bit-packed) destination, so no n×n
+        temporary is created. The count of the set pairs is accumulated per tile.
+
+        :param col_data: Numeric values of the attribute
+        :param eq: Encode equal values as gradual
+        :param packed: Bit-pack the bitmap into uint64 words
+        :param tile_rows: Number of rows compared per tile (all rows if None)
+        :param out: [optional] a preallocated destination (see get_bitmap_layout)
+        :return: The bitmap and the number of pairs it contains
+        """
+        n = col_data.size
+        tile_rows = n if tile_rows is None else max(1, min(tile_rows, n))
+        shape, dtype = DataGP.get_bitmap_layout(n, packed)
+        bin_mat = np.empty(shape, dtype=dtype) if out is None else out
+        tile_buf = np.empty((tile_rows, n), dtype=bool) if packed else None
+
+        pair_count = 0
+        with np.errstate(invalid='ignore'):
+            for r0 in range(0, n, tile_rows):
+                r1 = min(r0 + tile_rows, n)
+                tile = tile_buf[:r1 - r0] if tile_buf is not None else bin_mat[r0:r1]
+                if not eq:
+                    np.greater(col_data, col_data[r0:r1, np.newaxis], out=tile)
+                else:
+                    np.greater_equal(col_data, col_data[r0:r1, np.newaxis], out=tile)
+                    # Clear the diagonal
+                    tile[np.arange(r1 - r0), np.arange(r0, r1)] = False
+                pair_count += int(np.count_nonzero(tile))
+                if tile_buf is not None:
+                    bin_mat[r0:r1] = PairwiseMatrix.pack_bits(tile)
+        return bin_mat, pair_count
+
+    @staticmethod
+    def build_shared_bitmap(shm_name: str, col_data: np.ndarray, eq: bool, packed: bool, tile_rows: int) -> int:
+        """
+        Builds a bitmap inside a shared memory block (used by worker processes).
+
+        :param shm_name: Name of the shared memory block that receives the bitmap
+        :param col_data: Numeric values of the attribute
+        :param eq: Encode equal values as gradual
+        :param packed: Bit-pack the bitmap into uint64 words
+        :param tile_rows: Number of rows compared per tile
+        :return: The number of pairs in the bitmap
+        """
+        shape, dtype = DataGP.get_bitmap_layout(col_data.size, packed)
+        shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            out = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            _, pair_count = DataGP.build_bitmap(col_data, eq, packed, tile_rows, out=out)
+            del out
+        finally:
+            shm.close()
+        return pair_count
+
+    @staticmethod
+    def build_stored_bitmap(path: str, col_data: np.ndarray, eq: bool, packed: bool, tile_rows: int) -> int:
+        """
+        Builds a bitmap inside an existing memory-mapped '.npy' file (used by worker processes).
+
+        :param path: Path of the file that receives the bitmap
+        :param col_data: Numeric values of the attribute
+        :param eq: Encode equal values as gradual
+        :param packed: Bit-pack the bitmap into uint64 words
+        :param tile_rows: Number of rows compared per tile
+        :return: The number of pairs in the bitmap
+        """
+        out = np.load(path, mmap_mode='r+')
+        _, pair_count = DataGP.build_bitmap(col_data, eq, packed, tile_rows, out=out)
+        out.flush()
+        del out
+        return pair_count
+
     def fit_warpingset(self) -> None:
         """
         Generates transaction ids (tids) for each column/feature with numeric objects. It stores the tids in attribute
@@ -260,11 +951,13 @@ class DataGP:
             self.fit_bitmap()
             if self._valid_bins is None:
                 return
+        if self._valid_bins.support_engine is not None:
+            raise Exception("Warping sets require the 'bitmap' engine.")
 
         n = self._row_count
         self._warping_set = {}
         for gi_str, gi_data in self._valid_bins.items():
-            lst_ij: list = list(DataGP.gen_gradual_warping_set(gi_data.bin_mat))
+            lst_ij: list = list(DataGP.gen_gradual_warping_set(gi_data.to_dense()))
             # set_ij = set(sorted(list(lst_ij), key=lambda x: x[0])) ## Messes with the order of the items in the set
             tids_len = len(lst_ij)
             supp = float((tids_len*0.5) * (tids_len - 1)) / float(n * (n - 1.0) / 2.0)
@@ -470,6 +1163,218 @@ class DataGP:
             except Exception as error:
                 raise Exception("Error: " + str(error))
 
+    @staticmethod
+    def as_float(col_data) -> np.ndarray:
+        """
+        Returns the values of a column as a float array (without a copy if they are already floats).
+
+        :param col_data: Column values
+        :return: A float ndarray
+        """
+        col_data = np.asarray(col_data)
+        return col_data if col_data.dtype.kind == 'f' else col_data.astype(float)
+
+    @staticmethod
+    def get_epoch(date_str: str) -> int:
+        """
+        Converts a date-time string into its epoch (in seconds).
+
+        :param date_str: A date-time string
+        :return: The epoch or DataGP.INVALID_TIME if the string is not a date-time value
+        """
+        try:
+            ok, stamp = DataGP.test_time(date_str)
+            return int(stamp) if ok else DataGP.INVALID_TIME
+        except ValueError:
+            return DataGP.INVALID_TIME
+
+    @staticmethod
+    def read_csv(file_path: str, usecols: list | None = None, dtype=np.float64, chunk_size: int = 100000) -> \
+            tuple[list, np.ndarray, np.ndarray, list[np.ndarray], int]:
+        """
+        Loads a CSV file (optionally gzip-compressed) straight into a typed, column-major float matrix. The file is
+        parsed chunk by chunk (by the C parser of Pandas) and the rows of every chunk are written into a matrix
+        preallocated from the line count of the file, so the peak memory stays close to the size of the final matrix.
+
+        The header is detected with the same rules as DataGP.read. The column kinds are identified from the first
+        chunk: numeric columns are kept, date-time columns are kept as strings (see DataGP.get_epoch) and the other
+        columns are removed. A numeric column that holds a non-numeric value in a later chunk is removed as well (like
+        DataGP.clean_data does for the whole file). The rows with missing values in the kept columns are only dropped
+        (and counted) once the whole file is parsed, so the loaded data does not depend on chunk_size.
+
+        :param file_path: Path of the CSV file ('.gz' files are decompressed transparently)
+        :param usecols: [optional] the columns (indices or titles) to be loaded, the default is all the columns
+        :param dtype: Floating-point type of the matrix
+        :param chunk_size: Number of rows parsed per chunk
+        :return: The titles, the matrix (one row per column), the time columns, the date-time strings of each time
+        column and the number of dropped rows
+        """
+        file = str(file_path)
+        with open(file, 'rb') as f:
+            is_gzip = f.read(2) == b'\x1f\x8b'
+
+        def open_file(mode: str = 'r'):
+            """Opens the (compressed) file."""
+            if is_gzip:
+                return gzip.open(file, mode + 't' if mode == 'r' else mode)
+            return open(file, mode)
+
+        # 1. Sniff the dialect and detect the header (same rules as DataGP.read)
+        try:
+            with open_file() as f:
+                first_line = f.readline()
+                dialect = csv.Sniffer().sniff(first_line, delimiters=";,' '\t")
+                first_row = next(csv.reader([first_line], dialect), [])
+                second_line = f.readline()
+            if first_row == [] or second_line == '':
+                raise Exception("CSV file read error. File has little or no data")
+            if first_row[0].replace('.', '', 1).isdigit() or first_row[0].isdigit():
+                has_header = False
+            elif len(first_row) > 1 and (first_row[1].replace('.', '', 1).isdigit() or first_row[1].isdigit()):
+                has_header = False
+            else:
+                has_header = True
+            all_titles = first_row if has_header else ['col_' + str(k) for k in range(len(first_row))]
+
+            # 2. Column projection
+            if usecols is None:
+                sel_cols = list(range(len(all_titles)))
+            else:
+                sel_cols = sorted({all_titles.index(c) if isinstance(c, str) else int(c) for c in usecols})
+
+            # 3. Preallocate the matrix from the (upper bound) count of rows
+            with open_file('rb') as f:
+                line_count = 0
+                last_byte = b'\n'
+                for block in iter(lambda: f.read(1 << 24), b''):
+                    line_count += block.count(b'\n')
+                    last_byte = block[-1:]
+            row_bound = line_count + (last_byte != b'\n') - int(has_header)
+            mat = np.empty(len(sel_cols) * row_bound, dtype=dtype)
+            mat_view = mat.reshape(len(sel_cols), row_bound)
+
+            # 4. Parse the file chunk by chunk
+            reader = pd.read_csv(file, sep=dialect.delimiter, quotechar=dialect.quotechar, header=None,
+                                 skiprows=1 if has_header else 0, usecols=sel_cols, chunksize=chunk_size,
+                                 skipinitialspace=dialect.skipinitialspace, compression='gzip' if is_gzip else None)
+            col_kinds = None  # 'num', 'time' or None (removed) for every selected column
+            time_chunks = {}
+            row_count = 0
+            for chunk in reader:
+                if col_kinds is None:
+                    col_kinds = []
+                    for c in sel_cols:
+                        values = chunk[c]
+                        if values.dtype.kind in 'iuf' or pd.to_numeric(values.dropna(), errors='coerce').notna().all():
+                            col_kinds.append('num')
+                        else:
+                            col_kinds.append('time' if DataGP.is_time_column(values) else None)
+                    time_chunks = {k: [] for k, kind in enumerate(col_kinds) if kind == 'time'}
+
+                # All the rows are written (missing values as NaN); the rows are only dropped once the column kinds
+                # are final, since a later chunk may remove a column
+                chunk_rows = len(chunk)
+                for k, c in enumerate(sel_cols):
+                    if col_kinds[k] == 'num':
+                        values = chunk[c]
+                        if values.dtype.kind not in 'iuf':
+                            num_values = pd.to_numeric(values, errors='coerce')
+                            if (num_values.isna() & values.notna()).any():
+                                # A non-numeric value: the column is not numeric
+                                col_kinds[k] = None
+                                continue
+                            values = num_values
+                        mat_view[k, row_count:row_count + chunk_rows] = values.to_numpy(dtype=dtype)
+                    elif col_kinds[k] == 'time':
+                        time_chunks[k].append(chunk[c].to_numpy(dtype=object))
+                row_count += chunk_rows
+                del chunk
+        except Exception as error:
+            raise Exception("Error: " + str(error))
+        if col_kinds is None:
+            raise Exception("Data set is empty after cleaning.")
+
+        # 5. Drop the rows with missing values in the kept columns
+        kept = [k for k, kind in enumerate(col_kinds) if kind is not None]
+        time_values = {k: np.concatenate(time_chunks[k]) for k in kept if col_kinds[k] == 'time'}
+        valid = np.ones(row_count, dtype=bool)
+        for k in kept:
+            if col_kinds[k] == 'num':
+                valid &= ~np.isnan(mat_view[k, :row_count])
+            else:
+                valid &= pd.notna(time_values[k])
+        valid_count = int(np.count_nonzero(valid))
+        dropped = row_count - valid_count
+        if valid_count == 0:
+            raise Exception("Data set is empty after cleaning.")
+
+        # 6. Compact the matrix in place (keep the valid rows of the kept columns only)
+        for new_k, k in enumerate(kept):
+            mat[new_k * valid_count:(new_k + 1) * valid_count] = mat_view[k, :row_count][valid]
+        del mat_view
+        mat.resize(len(kept) * valid_count, refcheck=False)
+        attr_data = mat.reshape(len(kept), valid_count)
+
+        titles = [all_titles[sel_cols[k]] for k in kept]
+        time_cols = np.array([new_k for new_k, k in enumerate(kept) if col_kinds[k] == 'time'])
+        time_values = [time_values[k][valid] for k in kept if col_kinds[k] == 'time']
+        return titles, attr_data, time_cols, time_values, dropped
+
+    @staticmethod
+    def is_time_column(values, sample_size: int = 16) -> bool:
+        """
+        Tests if a column holds date-time values. Only a sample of (at most sample_size) evenly spaced non-missing
+        values is tested with DataGP.test_time.
+
+        :param values: Values of the column
+        :param sample_size: Number of values tested
+        :return: True if every sampled value is a date-time value, False otherwise
+        """
+        values = pd.Series(np.asarray(values, dtype=object)).dropna()
+        if values.size == 0:
+            return False
+        sample_idx = np.unique(np.linspace(0, values.size - 1, num=min(sample_size, values.size)).astype(int))
+        for val in values.iloc[sample_idx]:
+            try:
+                time_ok, _ = DataGP.test_time(str(val))
+                if not time_ok:
+                    return False
+            except ValueError:
+                return False
+        return True
+
+    @staticmethod
+    def parse_time_column(values) -> np.ndarray:
+        """
+        Converts the date-time values of a column into epochs (int64 seconds, local time like DataGP.test_time). The
+        format is inferred from the first value and the whole column is converted in one vectorized pass; only the
+        values that do not match the format are parsed one by one (see DataGP.get_epoch).
+
+        :param values: Date-time values of the column
+        :return: An int64 ndarray of epochs (DataGP.INVALID_TIME for invalid values)
+        """
+        str_values = pd.Series(np.asarray(values, dtype=object)).astype(str)
+        epochs = np.full(str_values.size, DataGP.INVALID_TIME, dtype=np.int64)
+        if str_values.size == 0:
+            return epochs
+
+        parsed = np.zeros(str_values.size, dtype=bool)
+        time_format = guess_datetime_format(str_values.iloc[0])
+        if time_format is not None:
+            try:
+                stamps = pd.to_datetime(str_values, format=time_format, errors='coerce')
+                if stamps.dt.tz is not None:
+                    # Keep the wall time (as DataGP.test_time does)
+                    stamps = stamps.dt.tz_localize(None)
+                stamps = stamps.dt.tz_localize(tz.tzlocal(), ambiguous='NaT', nonexistent='NaT')
+                parsed = stamps.notna().to_numpy()
+                epochs[parsed] = ((stamps[parsed] - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)).to_numpy()
+            except (ValueError, TypeError, AttributeError):
+                parsed[:] = False
+        for i in np.flatnonzero(~parsed):
+            epochs[i] = DataGP.get_epoch(str_values.iloc[i])
+        return epochs
+
     @staticmethod
     def test_time(date_str) -> None | tuple[bool, float] | tuple[bool, bool]:
         """
@@ -514,13 +1419,8 @@ class DataGP:
                 _ = df[col].astype(float)
             except ValueError:
                 # Keep time columns
-                try:
-                    ok, stamp = DataGP.test_time(str(df[col][0]))
-                    if not ok:
-                        cols_to_remove.append(col)
-                except ValueError:
+                if not DataGP.is_time_column(df[col]):
                     cols_to_remove.append(col)
-                pass
             except TypeError:
                 cols_to_remove.append(col)
                 pass
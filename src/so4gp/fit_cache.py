@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GNU GPL v3
+# This file is licensed under the terms of the GNU GPL v3.0.
+# See the LICENSE file at the root of this
+# repository for complete details.
+
+"""
+@author: Dickson Owuor
+@credits: Thomas Runkler, Edmond Menya, and Anne Laurent
+@license: GNU GPL v3
+@email: owuordickson@gmail.com
+@created: 17 October 2026
+@modified: 17 October 2026
+
+A persistent (on-disk) cache of fitted pairwise structures, shared across data-gp objects and processes.
+"""
+
+import os
+import time
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+from .bitmap_store import BitmapStore
+
+
+class FitCache:
+
+    def __init__(self, cache_dir: str, max_size: float | None = None):
+        """
+        A cache of the pairwise structures fitted for a dataset. Every dataset has an entry (a sub-directory) named
+        after its fingerprint, i.e., a hash of the cleaned data array together with the 'eq' option. An entry holds a
+        BitmapStore with the bitmaps and pair counts of all the attributes (no support threshold is applied before
+        storing them, so an entry serves every min_sup) and '.npz' archives of other structures (e.g., the net-win
+        matrices of ClusterGP).
+
+        The entries are evicted in least-recently-used order once the total size of the cache exceeds max_size.
+
+        >>> import numpy as np
+        >>> import so4gp as sgp
+        >>> cache = sgp.FitCache("gp_cache", max_size=1024)  # doctest: +SKIP
+        >>> key = sgp.FitCache.get_fingerprint(np.array([[1, 2], [3, 4]]), eq=False)
+        >>> store = cache.get_store(key)  # doctest: +SKIP
+
+        :param cache_dir: Directory of the cache (it is created if it does not exist)
+        :param max_size: [optional] maximum size (in MiB) of the cache, the default is None (no eviction)
+        """
+        self._cache_dir: str = os.path.abspath(cache_dir)
+        self._max_size: float | None = max_size
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+    @property
+    def cache_dir(self) -> str:
+        return self._cache_dir
+
+    @property
+    def max_size(self) -> float | None:
+        return self._max_size
+
+    def get_store(self, fingerprint: str) -> BitmapStore:
+        """
+        Returns the bitmap store of a dataset entry (it is created if it does not exist) and marks the entry as used.
+
+        :param fingerprint: Dataset fingerprint (see get_fingerprint)
+        :return: BitmapStore of the entry
+        """
+        store = BitmapStore(os.path.join(self._cache_dir, fingerprint))
+        self._touch(fingerprint)
+        return store
+
+    def load_arrays(self, fingerprint: str, name: str) -> dict[str, np.ndarray] | None:
+        """
+        Loads the arrays saved (through save_arrays) under a name in a dataset entry.
+
+        :param fingerprint: Dataset fingerprint
+        :param name: Name of the archive
+        :return: A dict of arrays or None if they are not cached
+        """
+        path = os.path.join(self._cache_dir, fingerprint, f"{name}.npz")
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as npz:
+            arrays = {key: npz[key] for key in npz.files}
+        self._touch(fingerprint)
+        return arrays
+
+    def save_arrays(self, fingerprint: str, name: str, **arrays: np.ndarray) -> None:
+        """
+        Saves arrays under a name in a dataset entry. The archive is written to a temporary file first and then moved
+        into place, so concurrent processes never read a partial archive.
+
+        :param fingerprint: Dataset fingerprint
+        :param name: Name of the archive
+        :param arrays: Arrays to be saved
+        """
+        entry_dir = os.path.join(self._cache_dir, fingerprint)
+        os.makedirs(entry_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=entry_dir, suffix='.npz.part')
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, os.path.join(entry_dir, f"{name}.npz"))
+        self._touch(fingerprint)
+
+    def evict(self, keep: str | None = None) -> None:
+        """
+        Removes the least-recently-used entries until the total size of the cache fits into max_size.
+
+        :param keep: [optional] fingerprint of an entry that is never evicted (e.g., the one in use)
+        """
+        if self._max_size is None:
+            return
+        entries = []
+        total_size = 0
+        for fingerprint in os.listdir(self._cache_dir):
+            entry_dir = os.path.join(self._cache_dir, fingerprint)
+            if not os.path.isdir(entry_dir):
+                continue
+            size = FitCache._get_dir_size(entry_dir)
+            total_size += size
+            entries.append((os.path.getmtime(entry_dir), fingerprint, size))
+
+        max_bytes = self._max_size * 1024 * 1024
+        for _, fingerprint, size in sorted(entries):
+            if total_size <= max_bytes:
+                break
+            if fingerprint == keep:
+                continue
+            shutil.rmtree(os.path.join(self._cache_dir, fingerprint), ignore_errors=True)
+            total_size -= size
+
+    def _touch(self, fingerprint: str) -> None:
+        """Marks a dataset entry as (most-recently) used."""
+        entry_dir = os.path.join(self._cache_dir, fingerprint)
+        try:
+            now = time.time()
+            os.utime(entry_dir, (now, now))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _get_dir_size(dir_path: str) -> int:
+        """Returns the total size (in bytes) of the files in a directory."""
+        size = 0
+        for entry in os.scandir(dir_path):
+            try:
+                if entry.is_file():
+                    size += entry.stat().st_size
+            except FileNotFoundError:
+                continue
+        return size
+
+    @staticmethod
+    def get_fingerprint(data: np.ndarray, eq: bool) -> str:
+        """
+        Computes the fingerprint of a (cleaned) dataset together with the 'eq' option.
+
+        :param data: Cleaned data array (e.g., the typed attribute matrix of a data-gp object)
+        :param eq: Encode equal values as gradual
+        :return: Fingerprint (hex digest)
+        """
+        data = np.asarray(data)
+        hasher = hashlib.sha1()
+        hasher.update(f"{data.shape}|eq={int(eq)}|".encode())
+        if data.dtype.kind in 'biuf':
+            hasher.update(f"{data.dtype.str}|".encode())
+            hasher.update(np.ascontiguousarray(data).tobytes())
+        else:
+            hasher.update(np.ascontiguousarray(data.astype(str)).tobytes())
+        return hasher.hexdigest()
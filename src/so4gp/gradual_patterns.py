@@ -15,13 +15,205 @@
 A collection of Gradual Pattern classes and methods.
 """
 import numpy as np
+from collections.abc import Mapping
 from dataclasses import dataclass
 
 
 @dataclass
 class PairwiseMatrix:
-    bin_mat: np.ndarray
+    """
+    The pairwise (bitmap) matrix of a gradual item/pattern together with its support. If packed is True, bin_mat
+    holds the rows of the n×n matrix bit-packed into uint64 words (8 object pairs per byte). If transposed is True, the
+    matrix represented is the transpose of bin_mat (i.e., the inverse gradual item/pattern); the transpose is never
+    materialized in storage. bin_mat is None if only the support was computed (matrix-free, see SupportEngine).
+    """
+    bin_mat: np.ndarray | None
     support: float
+    packed: bool = False
+    transposed: bool = False
+
+    @property
+    def dim(self) -> int:
+        """The number of objects (n) covered by the n×n pairwise matrix"""
+        return int(self.bin_mat.shape[0])
+
+    def count(self) -> int:
+        """
+        Counts the object pairs that respect the gradual item/pattern. A packed matrix is counted through word-level
+        popcount.
+
+        :return: Number of set bits in the pairwise matrix
+        """
+        if self.packed:
+            return int(np.bitwise_count(self.bin_mat).sum())
+        return int(np.count_nonzero(self.bin_mat))
+
+    def to_dense(self) -> np.ndarray:
+        """
+        Returns the pairwise matrix as a dense n×n boolean array (unpacks the bits if necessary). The inverse
+        orientation is returned as a transposed view.
+
+        :return: Dense boolean matrix
+        """
+        bool_mat = PairwiseMatrix.unpack_bits(self.bin_mat, self.dim) if self.packed else self.bin_mat
+        return bool_mat.T if self.transposed else bool_mat
+
+    def inverse(self) -> "PairwiseMatrix":
+        """
+        Returns the pairwise matrix of the inverse gradual item/pattern (it shares the storage of this matrix).
+
+        :return: PairwiseMatrix with the opposite orientation
+        """
+        return PairwiseMatrix(bin_mat=self.bin_mat, support=self.support, packed=self.packed,
+                              transposed=not self.transposed)
+
+    def read_rows(self, r0: int, r1: int, transposed: bool = False) -> np.ndarray:
+        """
+        Reads a block of rows of the stored matrix (or of its transpose) in the storage layout. Only the block is
+        loaded, so a memory-mapped bitmap can be streamed block by block.
+
+        :param r0: First row of the block
+        :param r1: End (exclusive) of the block
+        :param transposed: If True, reads rows r0:r1 of the transpose of bin_mat (i.e., its columns r0:r1)
+        :return: A block of r1-r0 rows (packed words or booleans)
+        """
+        if not transposed:
+            return self.bin_mat[r0:r1]
+        if self.packed:
+            return PairwiseMatrix.transpose_bits_block(self.bin_mat, self.dim, r0, r1)
+        return self.bin_mat[:, r0:r1].T
+
+    @staticmethod
+    def pack_bits(bool_mat: np.ndarray) -> np.ndarray:
+        """
+        Packs every row of a boolean matrix into uint64 words (the rows are zero-padded to a multiple of 64 bits).
+
+        :param bool_mat: A boolean matrix of shape (r, n)
+        :return: A uint64 matrix of shape (r, ceil(n/64))
+        """
+        row_count, col_count = bool_mat.shape
+        byte_count = -(-col_count // 64) * 8
+        packed = np.zeros((row_count, byte_count), dtype=np.uint8)
+        packed[:, :-(-col_count // 8)] = np.packbits(bool_mat, axis=1)
+        return packed.view(np.uint64)
+
+    @staticmethod
+    def unpack_bits(words: np.ndarray, n: int) -> np.ndarray:
+        """
+        Unpacks rows of uint64 words (created by pack_bits) into a boolean matrix.
+
+        :param words: A uint64 matrix of shape (r, ceil(n/64))
+        :param n: The number of columns of the unpacked matrix
+        :return: A boolean matrix of shape (r, n)
+        """
+        bytes_mat = np.ascontiguousarray(words).view(np.uint8)
+        return np.unpackbits(bytes_mat, axis=1, count=n).view(bool)
+
+    @staticmethod
+    def transpose_bits(words: np.ndarray, n: int, block_size: int = 1024) -> np.ndarray:
+        """
+        Transposes a bit-packed n×n matrix. The bits are swapped in blocks of columns so that only an n×block_size
+        boolean tile is unpacked at a time.
+
+        :param words: A uint64 matrix of shape (n, ceil(n/64))
+        :param n: The number of objects
+        :param block_size: Number of columns unpacked per tile (a multiple of 8)
+        :return: The packed transpose as a uint64 matrix of shape (n, ceil(n/64))
+        """
+        out = np.zeros_like(words)
+        block_size = max(8, block_size - block_size % 8)
+        for c0 in range(0, n, block_size):
+            c1 = min(c0 + block_size, n)
+            out[c0:c1] = PairwiseMatrix.transpose_bits_block(words, n, c0, c1)
+        return out
+
+    @staticmethod
+    def transpose_bits_block(words: np.ndarray, n: int, c0: int, c1: int) -> np.ndarray:
+        """
+        Computes rows c0:c1 of the transpose of a bit-packed n×n matrix (i.e., packs its columns c0:c1).
+
+        :param words: A uint64 matrix of shape (n, ceil(n/64))
+        :param n: The number of objects
+        :param c0: First column
+        :param c1: End (exclusive) column
+        :return: A uint64 matrix of shape (c1-c0, ceil(n/64))
+        """
+        bytes_mat = words.view(np.uint8)
+        offset = c0 % 8
+        tile = np.unpackbits(bytes_mat[:, c0 // 8:-(-c1 // 8)], axis=1)[:, offset:offset + c1 - c0]
+        out = np.zeros((c1 - c0, words.shape[1] * 8), dtype=np.uint8)
+        out[:, :-(-n // 8)] = np.packbits(tile.T, axis=1)
+        return out.view(np.uint64)
+
+
+class ValidBins(Mapping):
+
+    def __init__(self, support_engine=None):
+        """
+        A read-only mapping of gradual items (e.g., '0+', '0-') to their pairwise matrices. Only one (canonical)
+        pairwise matrix is stored for every attribute; the matrix of the decreasing item 'col-' is derived lazily by
+        flagging the canonical matrix as transposed, so neither a transposed copy nor a second bitmap is kept in memory.
+
+        >>> import numpy as np
+        >>> import so4gp as sgp
+        >>> col_data = np.array([1, 3, 2])
+        >>> v_bins = sgp.ValidBins()
+        >>> v_bins.add(0, sgp.PairwiseMatrix(bin_mat=col_data > col_data[:, np.newaxis], support=1.0))
+        >>> list(v_bins.keys())
+        ['0+', '0-']
+
+        :param support_engine: [optional] a SupportEngine that computes supports matrix-free (the stored pairwise
+        matrices then hold no bitmap)
+        :type support_engine: so4gp.SupportEngine | None
+        """
+        self._bins: dict[int, PairwiseMatrix] = {}
+        self._support_engine = support_engine
+
+    @property
+    def support_engine(self):
+        """The matrix-free SupportEngine (None if supports are computed from the bitmaps)"""
+        return self._support_engine
+
+    @property
+    def attr_cols(self) -> list[int]:
+        """The attribute columns whose pairwise matrices are stored"""
+        return list(self._bins.keys())
+
+    def add(self, attr_col: int, pw_mat: PairwiseMatrix) -> None:
+        """
+        Stores the canonical (increasing) pairwise matrix of an attribute.
+
+        :param attr_col: Column index
+        :param pw_mat: Pairwise matrix of the gradual item 'attr_col+'
+        """
+        self._bins[int(attr_col)] = pw_mat
+
+    def canonical(self, attr_col: int) -> PairwiseMatrix:
+        """Returns the stored (increasing) pairwise matrix of an attribute"""
+        return self._bins[int(attr_col)]
+
+    def copy(self) -> "ValidBins":
+        """Returns a shallow copy (the pairwise matrices are shared)"""
+        new_bins = ValidBins(support_engine=self._support_engine)
+        new_bins._bins = self._bins.copy()
+        return new_bins
+
+    def __getitem__(self, gi_str: str) -> PairwiseMatrix:
+        if not isinstance(gi_str, str) or len(gi_str) < 2 or gi_str[-1] not in ('+', '-'):
+            raise KeyError(gi_str)
+        try:
+            pw_mat = self._bins[int(gi_str[:-1])]
+        except ValueError:
+            raise KeyError(gi_str)
+        return pw_mat if gi_str[-1] == '+' else pw_mat.inverse()
+
+    def __iter__(self):
+        for attr_col in self._bins:
+            yield f"{attr_col}+"
+            yield f"{attr_col}-"
+
+    def __len__(self) -> int:
+        return 2 * len(self._bins)
 
 
 class GI:
@@ -126,6 +318,9 @@ class GI:
 
 class GP:
 
+    BLOCK_BYTES = 64 * 1024 * 1024
+    """Size (in bytes) of the blocks of rows in which memory-mapped bitmaps are streamed by perform_and."""
+
     def __init__(self):
         """
         GP (Gradual Pattern). A class that is used to create GP objects. A GP object is a set of gradual items (GI),
@@ -311,6 +506,7 @@ class GP:
         n = d_gp.attr_size
         gi_dict = d_gp.valid_bins.copy()
         gi_key_list = list(gi_dict.keys())
+        engine = gi_dict.support_engine if isinstance(gi_dict, ValidBins) else None
 
         gen_pattern: GP = GP()
         pw_mat_1: PairwiseMatrix | None = None
@@ -323,9 +519,14 @@ class GP:
                     gen_pattern.add_gradual_item(gi)
                 else:
                     pw_mat_2 = gi_dict[gi_key_list[i]]
-                    res_pw_mat = GP.perform_and(pw_mat_1, pw_mat_2, n)
+                    if engine is not None:
+                        # Matrix-free: count the pairs of the extended pattern directly
+                        res_pw_mat = PairwiseMatrix(bin_mat=None,
+                                                    support=engine.support(gen_pattern.gradual_items + [gi]))
+                    else:
+                        res_pw_mat = GP.perform_and(pw_mat_1, pw_mat_2, n, out=d_gp.allocate_bitmap())
                     if res_pw_mat.support >= min_supp:
-                        pw_mat_1 = PairwiseMatrix(bin_mat=res_pw_mat.bin_mat.copy(), support=res_pw_mat.support)
+                        pw_mat_1 = res_pw_mat
                         gen_pattern.add_gradual_item(gi)
                         gen_pattern.support = res_pw_mat.support
         if len(gen_pattern.gradual_items) <= 1:
@@ -583,20 +784,80 @@ class GP:
         return new_gp
 
     @staticmethod
-    def perform_and(bin_data_1: "PairwiseMatrix|None", bin_data_2: "PairwiseMatrix|None", dim: int) -> "PairwiseMatrix":
+    def perform_and(bin_data_1: "PairwiseMatrix|None", bin_data_2: "PairwiseMatrix|None", dim: int,
+                    out: np.ndarray | None = None) -> "PairwiseMatrix":
         """
-        Perform logical AND operation on two bitmaps.
+        Perform logical AND operation on two bitmaps. If both bitmaps are bit-packed, the AND is applied word by word
+        and the support is computed through popcount (the result stays packed). The orientation flag (transposed) of
+        each bitmap is honored without materializing the transposed matrices: two bitmaps with the same orientation
+        are combined directly since (A^T & B^T) = (A & B)^T.
+
+        If either bitmap is memory-mapped (see BitmapStore) or an output array is given, the AND is streamed block by
+        block of rows, so that only a few rows of each bitmap are loaded in memory at a time.
 
         :param bin_data_1: Bitmap 1
         :param bin_data_2: bitmap 2
         :param dim: dimension of the bitmaps
+        :param out: [optional] array where the result is written (e.g., a memory-mapped scratch bitmap); it must have
+        the layout of the result (packed if both bitmaps are packed)
         """
         if bin_data_1 is None or bin_data_2 is None:
             return PairwiseMatrix(bin_mat=np.zeros((dim, dim)), support=0)
-        bin_mat = bin_data_1.bin_mat * bin_data_2.bin_mat
+        if out is not None or isinstance(bin_data_1.bin_mat, np.memmap) or isinstance(bin_data_2.bin_mat, np.memmap):
+            return GP._perform_and_blocks(bin_data_1, bin_data_2, dim, out)
+        if bin_data_1.packed and bin_data_2.packed:
+            words_1 = bin_data_1.bin_mat
+            words_2 = bin_data_2.bin_mat
+            if bin_data_1.transposed != bin_data_2.transposed:
+                # Only one transpose is unavoidable; it is done tile by tile
+                words_2 = PairwiseMatrix.transpose_bits(words_2, bin_data_2.dim)
+            bin_mat = np.bitwise_and(words_1, words_2)
+            sup = float(np.bitwise_count(bin_mat).sum()) / float(dim * (dim - 1.0) / 2.0)
+            return PairwiseMatrix(bin_mat=bin_mat, support=sup, packed=True, transposed=bin_data_1.transposed)
+        if (not bin_data_1.packed) and (not bin_data_2.packed) and bin_data_1.transposed and bin_data_2.transposed:
+            bin_mat = bin_data_1.bin_mat * bin_data_2.bin_mat
+            sup = float(np.sum(bin_mat)) / float(dim * (dim - 1.0) / 2.0)
+            return PairwiseMatrix(bin_mat=bin_mat, support=sup, transposed=True)
+        bin_mat = bin_data_1.to_dense() * bin_data_2.to_dense()
         sup = float(np.sum(bin_mat)) / float(dim * (dim - 1.0) / 2.0)
         return PairwiseMatrix(bin_mat=bin_mat, support=sup)
 
+    @staticmethod
+    def _perform_and_blocks(bin_data_1: PairwiseMatrix, bin_data_2: PairwiseMatrix, dim: int,
+                            out: np.ndarray | None) -> PairwiseMatrix:
+        """
+        Performs the logical AND of two bitmaps block by block of rows. The result keeps the orientation of bitmap 1,
+        so only the rows of bitmap 2 are read through its transpose if the orientations differ.
+
+        :param bin_data_1: Bitmap 1
+        :param bin_data_2: Bitmap 2
+        :param dim: dimension of the bitmaps
+        :param out: [optional] array where the result is written
+        :return: The resulting PairwiseMatrix
+        """
+        n = bin_data_1.dim
+        packed = bin_data_1.packed and bin_data_2.packed
+        orientation = bin_data_1.transposed
+        if out is None:
+            shape = (n, -(-n // 64)) if packed else (n, n)
+            out = np.empty(shape, dtype=np.uint64 if packed else bool)
+        row_bytes = max(1, out.shape[1] * out.itemsize)
+        block_rows = max(8, (GP.BLOCK_BYTES // row_bytes) // 8 * 8)
+
+        pair_count = 0
+        for r0 in range(0, n, block_rows):
+            r1 = min(r0 + block_rows, n)
+            rows_1 = bin_data_1.read_rows(r0, r1)
+            rows_2 = bin_data_2.read_rows(r0, r1, transposed=(bin_data_2.transposed != orientation))
+            if not packed:
+                # Mixed layouts are combined as booleans
+                rows_1 = PairwiseMatrix.unpack_bits(rows_1, n) if bin_data_1.packed else rows_1
+                rows_2 = PairwiseMatrix.unpack_bits(rows_2, n) if bin_data_2.packed else rows_2
+            block = np.bitwise_and(rows_1, rows_2, out=out[r0:r1])
+            pair_count += int(np.bitwise_count(block).sum()) if packed else int(np.count_nonzero(block))
+        sup = float(pair_count) / float(dim * (dim - 1.0) / 2.0)
+        return PairwiseMatrix(bin_mat=out, support=sup, packed=packed, transposed=orientation)
+
 
 class TimeDelay:
 
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+# SPDX-License-Identifier: GNU GPL v3
+# This file is licensed under the terms of the GNU GPL v3.0.
+# See the LICENSE file at the root of this
+# repository for complete details.
+
+"""
+@author: Dickson Owuor
+@credits: Thomas Runkler, Edmond Menya, and Anne Laurent
+@license: GNU GPL v3
+@email: owuordickson@gmail.com
+@created: 17 October 2026
+@modified: 17 October 2026
+
+A matrix-free engine for computing the support of gradual patterns through rank/dominance counting.
+"""
+
+import numpy as np
+from .gradual_patterns import GI, GP
+
+
+class SupportEngine:
+
+    BRUTE_FORCE_SIZE = 512
+    """Sub-problems with at most this many objects (per side) are counted through a direct pairwise comparison."""
+
+    def __init__(self, attr_data: np.ndarray | list, attr_cols: np.ndarray | list, eq: bool = False):
+        """
+        A support engine that computes the support of a gradual pattern without building any n×n pairwise matrix.
+
+        The support of a GP is the count of object pairs (i, j) that are ordered consistently in every attribute of the
+        GP (i.e., the Kendall-tau concordance count generalized to k attributes). Each attribute is encoded once as
+        integer ranks; the pairs are then counted as dominance pairs of k-dimensional points: by sorting for 1-itemsets,
+        and by divide-and-conquer dominance counting for larger itemsets. A k-itemset costs O(n log^k n) time and O(n·k)
+        memory.
+
+        >>> import numpy as np
+        >>> import so4gp as sgp
+        >>> data = np.array([[30, 35, 40, 50, 52], [3, 2, 4, 1, 7]], dtype=float)
+        >>> engine = sgp.SupportEngine(data, attr_cols=[0, 1])
+        >>> engine.support(['0+', '1-'])
+        0.4
+
+        :param attr_data: Attribute data with one row per column (i.e., the transposed dataset)
+        :param attr_cols: Indices of the numeric attribute columns
+        :param eq: Encode equal values as gradual (i.e., count pairs whose values are equal)
+        """
+        self._include_equal_values: bool = eq
+        self._ranks: dict[int, np.ndarray] = {}
+        self._valid_rows: dict[int, np.ndarray | None] = {}
+        self._n: int = 0
+        for col in attr_cols:
+            col_data = np.asarray(attr_data[col], dtype=float)
+            self._n = col_data.size
+            nan_rows = np.isnan(col_data)
+            _, ranks = np.unique(col_data, return_inverse=True)
+            self._ranks[int(col)] = ranks.astype(np.int64)
+            self._valid_rows[int(col)] = ~nan_rows if np.any(nan_rows) else None
+
+    @property
+    def n(self) -> int:
+        """The number of objects"""
+        return self._n
+
+    def count(self, gp: GP | list | set | tuple) -> int:
+        """
+        Counts the ordered object pairs (i, j), with i != j, that respect every gradual item of the GP.
+
+        :param gp: A GP object or a collection of gradual items (GI objects or strings like '1+')
+        :return: Number of concordant object pairs
+        """
+        items = gp.gradual_items if isinstance(gp, GP) else [gi if isinstance(gi, GI) else GI.from_string(gi)
+                                                            for gi in gp]
+        if len(items) == 0:
+            return 0
+
+        coords = []
+        valid_rows = np.ones(self._n, dtype=bool)
+        for gi in items:
+            ranks = self._ranks[int(gi.attribute_col)]
+            coords.append(ranks if gi.symbol == "+" else -ranks)
+            if self._valid_rows[int(gi.attribute_col)] is not None:
+                valid_rows &= self._valid_rows[int(gi.attribute_col)]
+        pts = np.column_stack(coords)
+        if not np.all(valid_rows):
+            # Comparisons with missing values never hold
+            pts = pts[valid_rows]
+        return int(SupportEngine._count_dominance(pts, strict=not self._include_equal_values))
+
+    def support(self, gp: GP | list | set | tuple) -> float:
+        """
+        Computes the support of a GP (concordant pairs over all n(n-1)/2 object pairs).
+
+        :param gp: A GP object or a collection of gradual items (GI objects or strings like '1+')
+        :return: Support value
+        """
+        n = self._n
+        if n < 2:
+            return 0
+        return float(self.count(gp)) / float(n * (n - 1.0) / 2.0)
+
+    @staticmethod
+    def _count_dominance(pts: np.ndarray, strict: bool) -> int:
+        """
+        Counts the ordered pairs (i, j), i != j, such that point j dominates point i in every dimension (strictly if
+        strict is True). It splits the points at the median of the first dimension: pairs within each half are counted
+        recursively, and pairs across the halves are already ordered in the first dimension, so they are counted as a
+        (d-1)-dimensional bichromatic problem.
+
+        :param pts: Integer points of shape (m, d)
+        :param strict: Require strict dominance
+        :return: Number of dominance pairs
+        """
+        m, d = pts.shape
+        if m < 2:
+            return 0
+        if d == 0:
+            # No constraint left (only reached through equal values)
+            return m * (m - 1)
+        if d == 1:
+            _, tie_counts = np.unique(pts[:, 0], return_counts=True)
+            tie_pairs = int(np.sum(tie_counts * (tie_counts - 1) // 2))
+            all_pairs = m * (m - 1) // 2
+            return all_pairs - tie_pairs if strict else all_pairs + tie_pairs
+        if m <= SupportEngine.BRUTE_FORCE_SIZE:
+            return SupportEngine._count_brute_force(pts, pts, strict, same_set=True)
+
+        col = pts[:, 0]
+        pivot = np.partition(col, m // 2)[m // 2]
+        low, mid, high = (col < pivot), (col == pivot), (col > pivot)
+        rest = pts[:, 1:]
+        total = SupportEngine._count_dominance(pts[low], strict)
+        total += SupportEngine._count_dominance(pts[high], strict)
+        total += SupportEngine._count_cross(rest[low], rest[high], strict)
+        total += SupportEngine._count_cross(rest[low], rest[mid], strict)
+        total += SupportEngine._count_cross(rest[mid], rest[high], strict)
+        if not strict:
+            total += SupportEngine._count_dominance(rest[mid], strict)
+        return total
+
+    @staticmethod
+    def _count_cross(red: np.ndarray, blue: np.ndarray, strict: bool) -> int:
+        """
+        Counts the pairs (r, b), r from red and b from blue, such that b dominates r in every dimension.
+
+        :param red: Integer points of shape (p, d)
+        :param blue: Integer points of shape (q, d)
+        :param strict: Require strict dominance
+        :return: Number of dominance pairs
+        """
+        p, d = red.shape
+        q = blue.shape[0]
+        if p == 0 or q == 0:
+            return 0
+        if d == 0:
+            return p * q
+        if d == 1:
+            blue_sorted = np.sort(blue[:, 0])
+            side = 'right' if strict else 'left'
+            return int(p * q - np.sum(np.searchsorted(blue_sorted, red[:, 0], side=side)))
+        if p * q <= SupportEngine.BRUTE_FORCE_SIZE ** 2:
+            return SupportEngine._count_brute_force(red, blue, strict)
+
+        both = np.concatenate((red[:, 0], blue[:, 0]))
+        pivot = np.partition(both, both.size // 2)[both.size // 2]
+        r_col, b_col = red[:, 0], blue[:, 0]
+        r_low, r_mid, r_high = (r_col < pivot), (r_col == pivot), (r_col > pivot)
+        b_low, b_mid, b_high = (b_col < pivot), (b_col == pivot), (b_col > pivot)
+        r_rest, b_rest = red[:, 1:], blue[:, 1:]
+        total = SupportEngine._count_cross(red[r_low], blue[b_low], strict)
+        total += SupportEngine._count_cross(red[r_high], blue[b_high], strict)
+        total += SupportEngine._count_cross(r_rest[r_low], b_rest[b_high], strict)
+        total += SupportEngine._count_cross(r_rest[r_low], b_rest[b_mid], strict)
+        total += SupportEngine._count_cross(r_rest[r_mid], b_rest[b_high], strict)
+        if not strict:
+            total += SupportEngine._count_cross(r_rest[r_mid], b_rest[b_mid], strict)
+        return total
+
+    @staticmethod
+    def _count_brute_force(red: np.ndarray, blue: np.ndarray, strict: bool, same_set: bool = False) -> int:
+        """
+        Counts dominance pairs of small point sets by comparing every pair directly.
+
+        :param red: Integer points of shape (p, d)
+        :param blue: Integer points of shape (q, d)
+        :param strict: Require strict dominance
+        :param same_set: red and blue are the same point set (pairs of a point with itself are ignored)
+        :return: Number of dominance pairs
+        """
+        dominated = np.ones((red.shape[0], blue.shape[0]), dtype=bool)
+        for k in range(red.shape[1]):
+            if strict:
+                dominated &= blue[:, k] > red[:, k][:, np.newaxis]
+            else:
+                dominated &= blue[:, k] >= red[:, k][:, np.newaxis]
+        if same_set:
+            np.fill_diagonal(dominated, False)
+        return int(np.count_nonzero(dominated))
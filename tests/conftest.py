@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def output_dir(tmp_path, monkeypatch):
+    """Runs every test in a temporary directory (the miners write their output files into the working directory)."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
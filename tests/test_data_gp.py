@@ -0,0 +1,54 @@
+import numpy as np
+import pandas
+import pytest
+from so4gp import DataGP, SupportEngine
+from so4gp.algorithms import GRAANK
+
+
+@pytest.fixture
+def reclassified_csv(tmp_path):
+    # Column X is empty in row 1 and turns non-numeric in row 11, so it is removed (and row 1 is kept)
+    lines = ["Date,A,B,X"]
+    for i in range(20):
+        x_value = "" if i == 1 else ("abc" if i == 11 else str(2 * i))
+        date_value = "" if i == 15 else f"2021-01-{i + 1:02d}"
+        lines.append(f"{date_value},{i},{20 - i},{x_value}")
+    file_path = tmp_path / "reclassified.csv"
+    file_path.write_text("\n".join(lines) + "\n")
+    return str(file_path)
+
+
+@pytest.mark.parametrize("chunk_size", [100000, 4, 3, 1])
+def test_read_csv_does_not_depend_on_chunk_size(reclassified_csv, chunk_size):
+    titles, attr_data, time_cols, time_values, dropped = DataGP.read_csv(reclassified_csv, chunk_size=chunk_size)
+
+    assert titles == ["Date", "A", "B"]
+    assert time_cols.tolist() == [0]
+    # Only the row with a missing date is dropped
+    assert dropped == 1
+    kept_rows = [i for i in range(20) if i != 15]
+    np.testing.assert_array_equal(attr_data[1], kept_rows)
+    np.testing.assert_array_equal(attr_data[2], [20 - i for i in kept_rows])
+    assert list(time_values[0]) == [f"2021-01-{i + 1:02d}" for i in kept_rows]
+
+
+@pytest.mark.parametrize("engine", ['bitmap', 'rank'])
+def test_append_rows_matches_new_fit(engine):
+    rng = np.random.default_rng(7)
+    data = rng.integers(0, 6, size=(40, 4)).astype(float)
+    data[:, 1] = data[:, 0] + rng.integers(0, 3, 40)
+    columns = ['A', 'B', 'C', 'D']
+
+    mine_obj = GRAANK(data_source=pandas.DataFrame(data[:30], columns=columns), min_sup=0.3, engine=engine)
+    mine_obj.discover(compute_descriptors=False)
+    changes = mine_obj.append_rows(data[30:])
+
+    new_obj = GRAANK(data_source=pandas.DataFrame(data, columns=columns), min_sup=0.3)
+    support_engine = SupportEngine(new_obj.attr_data, new_obj.attr_cols)
+    assert changes["Appended Rows"] == 10
+    assert len(mine_obj.gradual_patterns) > 0
+    # The kept GPs hold the supports of a new fit, and the vanished ones are no longer frequent
+    for gp in mine_obj.gradual_patterns:
+        assert gp.support == round(support_engine.support(gp.to_string()), 3)
+    for gp in changes["Vanished Patterns"]:
+        assert support_engine.support(gp.to_string()) <= 0.3
@@ -0,0 +1,116 @@
+import itertools
+import json
+import numpy as np
+import pandas
+import pytest
+from so4gp import SupportEngine
+from so4gp.algorithms import GRAANK
+
+COLUMNS = ['A', 'B', 'C', 'D']
+DUMMY_DATA = [[8, 1, 2, 3], [2, 8, 8, 6], [1, 1, 3, 4], [6, 5, 3, 2], [7, 7, 1, 2], [5, 4, 8, 5], [4, 4, 6, 6]]
+
+
+def random_df(seed: int, n: int = 12, m: int = 5) -> pandas.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = rng.integers(0, 6, size=(n, m)).astype(float)
+    # (a correlated pair of columns, so that larger GPs are found)
+    data[:, 1] = data[:, 0] + rng.integers(0, 3, n)
+    return pandas.DataFrame(data, columns=[f'col_{k}' for k in range(m)])
+
+
+def mine(df: pandas.DataFrame, min_sup: float, **kwargs) -> list[tuple[tuple[str, ...], float]]:
+    mine_obj = GRAANK(data_source=df, min_sup=min_sup)
+    mine_obj.discover(compute_descriptors=False, **kwargs)
+    return sorted((tuple(gp.to_string()), gp.support) for gp in mine_obj.gradual_patterns)
+
+
+def enumerate_gps(df: pandas.DataFrame, min_sup: float) -> dict[tuple[str, ...], float]:
+    """Computes the support of every GP (in both orientations) by brute force and keeps the frequent ones."""
+    engine = SupportEngine(np.asarray(df, dtype=float).T, range(df.shape[1]))
+    frequent_gps = {}
+    for k in range(2, df.shape[1] + 1):
+        for cols in itertools.combinations(range(df.shape[1]), k):
+            for gp in itertools.product(*[(f'{col}+', f'{col}-') for col in cols]):
+                supp = engine.support(list(gp))
+                if supp > min_sup:
+                    frequent_gps[gp] = supp
+    return frequent_gps
+
+
+def filter_gps(frequent_gps: dict[tuple[str, ...], float], mode: str) -> list[tuple[tuple[str, ...], float]]:
+    """Keeps the maximal or the closed GPs (in their canonical orientation) of a brute-force enumeration."""
+    kept_gps = []
+    for gp, supp in frequent_gps.items():
+        if not gp[0].endswith('+'):
+            continue
+        if mode == 'maximal':
+            is_kept = not any(set(gp) < set(other) for other in frequent_gps)
+        else:
+            is_kept = not any(set(gp) < set(other) and np.isclose(frequent_gps[other], supp) for other in frequent_gps)
+        if is_kept:
+            kept_gps.append((gp, round(supp, 3)))
+    return sorted(kept_gps)
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("min_sup", [0.3, 0.5])
+def test_dfs_matches_bfs(seed, min_sup):
+    df = random_df(seed)
+    for mode in ('maximal', 'closed'):
+        assert mine(df, min_sup, strategy='dfs', mode=mode) == mine(df, min_sup, strategy='bfs', mode=mode)
+
+
+@pytest.mark.parametrize("strategy", ['bfs', 'dfs'])
+@pytest.mark.parametrize("mode", ['maximal', 'closed'])
+def test_modes_match_brute_force(strategy, mode):
+    dummy_df = pandas.DataFrame(DUMMY_DATA, columns=COLUMNS)
+    expected = {
+        'maximal': [(('0+', '2-', '3-'), 0.524)],
+        'closed': [(('0+', '2-'), 0.667), (('0+', '2-', '3-'), 0.524), (('0+', '3-'), 0.667), (('2+', '3+'), 0.714)]}
+    assert filter_gps(enumerate_gps(dummy_df, 0.5), mode) == expected[mode]
+    assert mine(dummy_df, 0.5, strategy=strategy, mode=mode) == expected[mode]
+
+    for seed in range(6):
+        df = random_df(seed)
+        assert mine(df, 0.3, strategy=strategy, mode=mode) == filter_gps(enumerate_gps(df, 0.3), mode)
+
+
+@pytest.mark.parametrize("strategy", ['bfs', 'dfs'])
+@pytest.mark.parametrize("mode", ['maximal', 'closed'])
+def test_append_rows_matches_new_fit(strategy, mode):
+    new_rows = [[2, 7, 7, 9]]
+    mine_obj = GRAANK(data_source=pandas.DataFrame(DUMMY_DATA, columns=COLUMNS), min_sup=0.5)
+    mine_obj.discover(strategy=strategy, mode=mode)
+    mine_obj.append_rows(new_rows)
+
+    all_df = pandas.DataFrame(DUMMY_DATA + new_rows, columns=COLUMNS)
+    engine = SupportEngine(np.asarray(all_df, dtype=float).T, range(len(COLUMNS)))
+    assert len(mine_obj.gradual_patterns) > 0
+    for gp in mine_obj.gradual_patterns:
+        assert gp.support == round(engine.support(gp.to_string()), 3)
+
+
+@pytest.mark.parametrize("strategy", ['bfs', 'dfs'])
+@pytest.mark.parametrize("mode", ['maximal', 'closed'])
+@pytest.mark.parametrize("top_k", [1, 3, 10])
+def test_top_k_matches_brute_force(strategy, mode, top_k):
+    for seed in range(6):
+        df = random_df(seed)
+        frequent_gps = enumerate_gps(df, 0.2)
+        supports = sorted((supp for gp, supp in frequent_gps.items() if gp[0].endswith('+')), reverse=True)
+        # The minimum support is raised to the K-th best support
+        threshold = supports[top_k - 1] if len(supports) >= top_k else 0.2
+        top_gps = {gp: supp for gp, supp in frequent_gps.items() if supp >= threshold}
+
+        mine_obj = GRAANK(data_source=df, min_sup=0.2)
+        result = json.loads(mine_obj.discover(strategy=strategy, mode=mode, top_k=top_k, compute_descriptors=False))
+        found_gps = [(tuple(gp.to_string()), gp.support) for gp in mine_obj.gradual_patterns]
+        assert sorted(found_gps) == filter_gps(top_gps, mode)
+        assert [supp for _, supp in found_gps] == sorted((supp for _, supp in found_gps), reverse=True)
+        if len(supports) >= top_k:
+            assert float(result["Top-k Support"]) == round(threshold, 3)
+
+
+def test_top_k_is_positive():
+    with pytest.raises(ValueError):
+        GRAANK(data_source=pandas.DataFrame(DUMMY_DATA, columns=COLUMNS)).discover(top_k=0)
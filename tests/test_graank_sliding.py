@@ -0,0 +1,35 @@
+import numpy as np
+import pandas
+import pytest
+from so4gp.algorithms import GRAANK, SlidingGRAANK
+
+COLUMNS = ['A', 'B', 'C', 'D', 'E']
+
+
+def get_patterns(mine_obj) -> list[tuple[tuple[str, ...], float]]:
+    return sorted((tuple(gp.to_string()), gp.support) for gp in mine_obj.gradual_patterns)
+
+
+@pytest.mark.parametrize("eq", [False, True])
+def test_slide_matches_mining_the_window(eq):
+    rng = np.random.default_rng(3)
+    window_size, total = 20, 60
+    data = rng.integers(0, 6, size=(total, len(COLUMNS))).astype(float)
+    data[:, 1] = data[:, 0] + rng.integers(0, 2, total)
+    data[:, 3] = -data[:, 0] + rng.integers(0, 3, total)
+
+    mine_obj = SlidingGRAANK(pandas.DataFrame(data[:12], columns=COLUMNS), min_sup=0.3, eq=eq,
+                             window_size=window_size)
+    mine_obj.discover(compute_descriptors=False)
+    for end in range(13, total + 1):
+        deltas = mine_obj.slide(data[end - 1:end])
+        window_obj = GRAANK(pandas.DataFrame(data[max(0, end - window_size):end], columns=COLUMNS), min_sup=0.3,
+                            eq=eq)
+        window_obj.discover(compute_descriptors=False)
+        assert len(deltas) == 1
+        assert get_patterns(mine_obj) == get_patterns(window_obj)
+
+
+def test_window_size_is_checked():
+    with pytest.raises(ValueError):
+        SlidingGRAANK(pandas.DataFrame(np.zeros((4, 3)), columns=COLUMNS[:3]), window_size=1)
@@ -0,0 +1,59 @@
+import json
+import numpy as np
+import pandas
+import pytest
+from so4gp.algorithms import TGrad
+
+
+@pytest.fixture
+def time_series_df():
+    rng = np.random.default_rng(3)
+    n = 18
+    trend = np.arange(n + 5)
+    return pandas.DataFrame({
+        "Date": pandas.date_range("2021-01-01", periods=n, freq="D").strftime("%Y-%m-%d"),
+        "A": trend[5:] + 0.3 * rng.normal(size=n),
+        "B": 2.0 * trend[:n],
+        "C": -1.0 * trend[2:n + 2]})
+
+
+@pytest.mark.parametrize("mine_first", [False, True])
+def test_append_rows_matches_new_fit(time_series_df, mine_first):
+    mine_obj = TGrad(time_series_df.iloc[:16], min_sup=0.5, target_col=1, min_rep=0.5)
+    if mine_first:
+        mine_obj.discover_tgp()
+    changes = mine_obj.append_rows(time_series_df.iloc[16:])
+
+    new_obj = TGrad(time_series_df, min_sup=0.5, target_col=1, min_rep=0.5)
+    assert changes["Appended Rows"] == 2
+    assert mine_obj.row_count == new_obj.row_count
+    assert mine_obj.max_step == new_obj.max_step
+    np.testing.assert_array_equal(mine_obj.full_attr_data, new_obj.full_attr_data)
+    patterns = json.loads(new_obj.discover_tgp())["Patterns"]
+    assert len(patterns) > 0
+    assert json.loads(mine_obj.discover_tgp())["Patterns"] == patterns
+
+
+def test_append_rows_resets_worker_pool(time_series_df):
+    mine_obj = TGrad(time_series_df.iloc[:16], min_sup=0.5, target_col=1, min_rep=0.5)
+    try:
+        mine_obj.discover_tgp(parallel=True, num_cores=2)
+        mine_obj.append_rows(time_series_df.iloc[16:])
+        result_json = mine_obj.discover_tgp(parallel=True, num_cores=2)
+    finally:
+        mine_obj.close_pool()
+
+    new_obj = TGrad(time_series_df, min_sup=0.5, target_col=1, min_rep=0.5)
+    assert json.loads(result_json)["Patterns"] == json.loads(new_obj.discover_tgp())["Patterns"]
+
+
+def test_fit_cache_skips_stepped_bitmaps(time_series_df, tmp_path):
+    cache_dir = tmp_path / "cache"
+    mine_obj = TGrad(time_series_df, min_sup=0.5, target_col=1, min_rep=0.5, packed=True, cache_dir=str(cache_dir),
+                     cache_size=0.01)
+    patterns = json.loads(mine_obj.discover_tgp())["Patterns"]
+
+    # The bit-packed steps are fitted on their delayed data, which is not cached
+    assert not any(path.is_file() for path in cache_dir.rglob("*"))
+    new_obj = TGrad(time_series_df, min_sup=0.5, target_col=1, min_rep=0.5, packed=True)
+    assert patterns == json.loads(new_obj.discover_tgp())["Patterns"]